@@ -0,0 +1,251 @@
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+# NOTE: The benchmarks run against the pptx_chart package of this checkout
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from pptx_chart.charts import (
+    add_chart,
+    compile_specs,
+    get_facet_ids_col,
+    load_presentation,
+    make_chart_data,
+    parse_specs,
+    read_data,
+    save_presentation,
+    update_chart
+)
+
+BENCHMARKS = [
+    'add_chart',
+    'update_chart',
+    'update_chart_format',
+    'parse_specs',
+    'make_chart_data',
+    'chart_workbook',
+    'save'
+]
+
+
+def make_dataset(rows, series, facets, x_type, workbook_writer='xlsxwriter', seed=0):
+    rng = np.random.default_rng(seed)
+    if x_type == 'date':
+        x_values = pd.date_range('2000-01-01', periods=rows, freq='D').strftime('%Y-%m-%d')
+    else:
+        x_values = ['category_{}'.format(i) for i in range(rows)]
+    facet_ids = ['facet_{}'.format(i) for i in range(facets)]
+
+    data = pd.DataFrame({
+        'x': np.tile(x_values, facets),
+        'facet': np.repeat(facet_ids, rows)
+    })
+    for i in range(series):
+        data['value_{}'.format(i)] = rng.normal(size=len(data)).round(4)
+        data['y.{}.col'.format(i)] = 'value_{}'.format(i)
+        data['y.{}.name'.format(i)] = 'Series {}'.format(i)
+        data['y.{}.line_width'.format(i)] = 1.5
+
+    data['x_axis.col'] = 'x'
+    data['x_axis.type'] = x_type
+    data['x_axis.tick_size'] = 8
+    data['y_axis.tick_size'] = 8
+    data['legend.enabled'] = 'false'
+    data['chart.type'] = 'line'
+    data['chart.width'] = 6
+    data['chart.height'] = 5
+    data['chart.title'] = data['facet']
+    data['chart.title_size'] = 8
+    data['chart.id'] = 'CHART__' + data['facet']
+    data['chart.workbook_writer'] = workbook_writer
+    if facets > 1:
+        data['facet.col'] = 'facet'
+    return data
+
+
+def make_case_files(work_dir, rows, series, facets, x_type, workbook_writer):
+    data_file = os.path.join(work_dir, 'data.csv')
+    make_dataset(rows, series, facets, x_type, workbook_writer).to_csv(data_file, index=False)
+
+    # NOTE: Template deck used by the update and save benchmarks
+    pptx_file = os.path.join(work_dir, 'template.pptx')
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        add_chart(output_file=pptx_file, data_file=data_file)
+    return data_file, pptx_file
+
+
+def make_benchmark(name, data_file, pptx_file, work_dir, facets):
+    output_file = os.path.join(work_dir, 'output.pptx')
+    shape_id = 'CHART__facet_0' if facets == 1 else None
+
+    if name == 'add_chart':
+        return lambda: add_chart(output_file=output_file, data_file=data_file)
+    if name in ('update_chart', 'update_chart_format'):
+        return lambda: update_chart(
+            input_file=pptx_file,
+            data_file=data_file,
+            slide_idx=0,
+            shape_id=shape_id,
+            output_file=output_file,
+            should_update_format=(name == 'update_chart_format')
+        )
+
+    data = read_data(data_file)
+    if name == 'parse_specs':
+        if facets == 1:
+            return lambda: parse_specs(data)
+        return lambda: compile_specs(data, get_facet_ids_col(data))
+    if name in ('make_chart_data', 'chart_workbook'):
+        specs = parse_specs(data)
+        if facets == 1:
+            groups = [data]
+        else:
+            groups = [group for _, group in data.groupby(get_facet_ids_col(data), sort=False)]
+        if name == 'make_chart_data':
+            return lambda: [make_chart_data(group, specs['x'], specs['y'], specs['chart'])
+                            for group in groups]
+        chart_datas = [make_chart_data(group, specs['x'], specs['y'], specs['chart'])
+                       for group in groups]
+        return lambda: [chart_data.xlsx_blob for chart_data in chart_datas]
+    if name == 'save':
+        # NOTE: Loaded from the file so saving copies the unchanged parts, as
+        # the CLI and the server do
+        presentation = load_presentation(pptx_file)
+        return lambda: save_presentation(presentation)
+    raise ValueError('Unknown benchmark: {}'.format(name))
+
+
+def measure(func, repeat):
+    timings = []
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start_time)
+
+        # NOTE: Peak memory is measured on a separate run since tracemalloc
+        # slows down allocation heavy code
+        tracemalloc.start()
+        func()
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return timings, peak_memory
+
+
+def run_benchmarks(
+        rows_list, 
+        series_list, 
+        facets_list, 
+        x_types, 
+        workbook_writers, 
+        benchmarks, 
+        repeat):
+    results = []
+    cases = itertools.product(rows_list, series_list, facets_list, x_types, workbook_writers)
+    for rows, series, facets, x_type, workbook_writer in cases:
+        with tempfile.TemporaryDirectory() as work_dir:
+            data_file, pptx_file = make_case_files(
+                work_dir, rows, series, facets, x_type, workbook_writer)
+            for name in benchmarks:
+                func = make_benchmark(name, data_file, pptx_file, work_dir, facets)
+                timings, peak_memory = measure(func, repeat)
+                result = {
+                    'benchmark': name,
+                    'rows': rows,
+                    'series': series,
+                    'facets': facets,
+                    'x_type': x_type,
+                    'workbook_writer': workbook_writer,
+                    'repeat': repeat,
+                    'seconds_min': min(timings),
+                    'seconds_mean': sum(timings) / len(timings),
+                    'peak_memory_mb': peak_memory / 2 ** 20,
+                    'facets_per_second': facets / min(timings)
+                }
+                results.append(result)
+                print('{benchmark:<20} rows={rows:<7} series={series:<3} facets={facets:<5} '
+                      'x={x_type:<6} writer={workbook_writer:<10} {seconds_min:9.4f}s {peak_memory_mb:9.1f}MB '
+                      '{facets_per_second:10.1f} facets/s'.format(**result))
+    return results
+
+
+def result_key(result):
+    return (
+        result['benchmark'], 
+        result['rows'], 
+        result['series'], 
+        result['facets'], 
+        result['x_type'], 
+        result.get('workbook_writer', 'xlsxwriter')
+    )
+
+
+def find_regressions(results, baseline_results, max_slowdown):
+    baseline_index = {result_key(result): result for result in baseline_results}
+    regressions = []
+    for result in results:
+        baseline = baseline_index.get(result_key(result))
+        if baseline is None:
+            continue
+        slowdown = baseline['facets_per_second'] / result['facets_per_second']
+        if slowdown > max_slowdown:
+            regressions.append((result, slowdown))
+    return regressions
+
+
+def parse_list(value, item_type=int):
+    return [item_type(item) for item in value.split(',')]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(prog='run_benchmarks')
+    arg_parser.add_argument('--rows', default='100,1000', help='Comma separated rows per facet.')
+    arg_parser.add_argument('--series', default='1,4', help='Comma separated number of y series.')
+    arg_parser.add_argument('--facets', default='1,50', help='Comma separated number of facets (1 = no facet.col).')
+    arg_parser.add_argument('--x-types', default='date,string', help='Comma separated x axis types (date, string).')
+    arg_parser.add_argument('--workbook-writers', default='xlsxwriter', help='Comma separated chart.workbook_writer values (xlsxwriter, fast).')
+    arg_parser.add_argument('--benchmarks', default=','.join(BENCHMARKS), help='Comma separated benchmarks to run.')
+    arg_parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark (the fastest is reported).')
+    arg_parser.add_argument('-o', '--output', help='JSON file to write the results to.')
+    arg_parser.add_argument('--baseline', help='JSON results from a previous run to compare facet throughput against.')
+    arg_parser.add_argument('--max-slowdown', type=float, default=1.2, help='Largest allowed baseline/current facet throughput ratio (use with --baseline).')
+    args = arg_parser.parse_args()
+
+    results = run_benchmarks(
+        rows_list=parse_list(args.rows),
+        series_list=parse_list(args.series),
+        facets_list=parse_list(args.facets),
+        x_types=parse_list(args.x_types, str),
+        workbook_writers=parse_list(args.workbook_writers, str),
+        benchmarks=parse_list(args.benchmarks, str),
+        repeat=args.repeat
+    )
+
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline_results = json.load(f)
+        regressions = find_regressions(results, baseline_results, args.max_slowdown)
+        for result, slowdown in regressions:
+            print('REGRESSION: {benchmark} rows={rows} series={series} facets={facets} '
+                  'x={x_type} writer={workbook_writer} is {slowdown:.2f}x slower'.format(slowdown=slowdown, **result))
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
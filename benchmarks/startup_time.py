@@ -0,0 +1,72 @@
+import argparse
+import os
+import subprocess
+import sys
+import time
+
+# NOTE: The commands run against the pptx_chart package of this checkout
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# NOTE: Modules that must not be imported by the CLI until a chart operation
+# runs
+HEAVY_MODULES = ['numpy', 'pandas', 'pptx', 'tqdm']
+
+COMMANDS = {
+    'help': ['-m', 'pptx_chart', '--help'],
+    'argument_error': ['-m', 'pptx_chart', '-o', 'output.pptx'],
+    'import': ['-c', 'import pptx_chart.__main__']
+}
+
+
+def get_command_env():
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [REPO_ROOT, env.get('PYTHONPATH')]))
+    return env
+
+
+def measure_command(args, repeat):
+    timings = []
+    env = get_command_env()
+    for _ in range(repeat):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable] + args, capture_output=True, env=env)
+        timings.append(time.perf_counter() - start_time)
+    return timings
+
+
+def find_imported_modules(args):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + args, capture_output=True, text=True, env=get_command_env())
+    modules = set()
+    for line in result.stderr.splitlines():
+        if line.startswith('import time:') and '|' in line:
+            modules.add(line.rsplit('|', 1)[1].strip())
+    return modules
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(prog='startup_time')
+    arg_parser.add_argument('--repeat', type=int, default=10, help='Runs per command (the fastest is reported).')
+    arg_parser.add_argument('--max-seconds', type=float, default=0.25, help='Import time budget: the slowest command may take at most this many seconds (fastest run).')
+    args = arg_parser.parse_args()
+
+    baseline = min(measure_command(['-c', 'pass'], args.repeat))
+    print('{:<20} {:9.4f}s'.format('interpreter', baseline))
+
+    failed = False
+    for name, command_args in COMMANDS.items():
+        seconds = min(measure_command(command_args, args.repeat))
+        heavy_modules = sorted(set(HEAVY_MODULES) & find_imported_modules(command_args))
+        print('{:<20} {:9.4f}s (+{:.4f}s)'.format(name, seconds, seconds - baseline))
+        if seconds > args.max_seconds:
+            print('OVER BUDGET: {} took {:.4f}s (budget {:.4f}s)'.format(name, seconds, args.max_seconds))
+            failed = True
+        if heavy_modules:
+            print('HEAVY IMPORTS: {} imported {}'.format(name, ', '.join(heavy_modules)))
+            failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,21 @@
+# NOTE: The public API is loaded on first use so that the CLI (which imports
+# this package first) does not pay for importing pandas and python-pptx
+API_NAMES = (
+    'add_chart',
+    'update_chart',
+    'render_chart',
+    'render_chart_update',
+    'add_presentation_chart',
+    'update_presentation_chart',
+    'load_presentation',
+    'save_presentation'
+)
+
+__all__ = list(API_NAMES)
+
+
+def __getattr__(name):
+    if name in API_NAMES:
+        from pptx_chart import charts
+        return getattr(charts, name)
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
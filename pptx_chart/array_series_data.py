@@ -0,0 +1,20 @@
+from pptx.chart.data import CategorySeriesData
+
+
+class ArraySeriesData(CategorySeriesData):
+    # NOTE: Holds the (already cleaned) values as a single list instead of one
+    # CategoryDataPoint object per value. The chart XML and workbook writers
+    # only rely on `values` and `len(series)`.
+    def __init__(self, chart_data, name, values, number_format=None):
+        super().__init__(chart_data, name, number_format)
+        self._values = values
+
+    def __getitem__(self, index):
+        return self._values.__getitem__(index)
+
+    def __len__(self):
+        return self._values.__len__()
+
+    @property
+    def values(self):
+        return self._values
@@ -0,0 +1,78 @@
+import hashlib
+import json
+
+from lxml import etree
+from pptx.oxml.ns import qn
+
+# NOTE: The digest is stored as an extension of the chart shape's non-visual
+# properties (p:cNvPr/a:extLst) so it travels with the shape but is not
+# visible anywhere in PowerPoint
+DIGEST_EXT_URI = '{B3A8F2D4-6C1E-4F7A-9D52-8E0C4A7B1F36}'
+DIGEST_NAMESPACE = 'https://github.com/OrthogonalJ/pptx_chart'
+DIGEST_TAG = '{%s}digest' % DIGEST_NAMESPACE
+
+
+def compute_digest(category_hashes, values, is_valid, metadata=None):
+    hasher = hashlib.sha256()
+    hasher.update(category_hashes.tobytes())
+    hasher.update(values.shape.__repr__().encode('utf-8'))
+    hasher.update(is_valid.tobytes())
+    hasher.update(values[is_valid].tobytes())
+    hasher.update(json.dumps(metadata, sort_keys=True, default=str).encode('utf-8'))
+    return hasher.hexdigest()
+
+
+def compute_format_digest(specs):
+    return hashlib.sha256(json.dumps(specs, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+def _get_c_nv_pr(chart_shape):
+    return chart_shape._element.xpath('./p:nvGraphicFramePr/p:cNvPr')[0]
+
+
+def _find_digest_ext(c_nv_pr):
+    for ext in c_nv_pr.iterfind('{}/{}'.format(qn('a:extLst'), qn('a:ext'))):
+        if ext.get('uri') == DIGEST_EXT_URI:
+            return ext
+    return None
+
+
+def _read_digest_attribute(chart_shape, name):
+    ext = _find_digest_ext(_get_c_nv_pr(chart_shape))
+    if ext is None:
+        return None
+    digest = ext.find(DIGEST_TAG)
+    return digest.get(name) if digest is not None else None
+
+
+def read_chart_digest(chart_shape):
+    return _read_digest_attribute(chart_shape, 'value')
+
+
+def read_chart_format_digest(chart_shape):
+    return _read_digest_attribute(chart_shape, 'format')
+
+
+def is_chart_unchanged(chart_shape, digest, format_digest=None):
+    # NOTE: format_digest is only given when the chart format is (re)applied
+    if read_chart_digest(chart_shape) != digest:
+        return False
+    return format_digest is None or read_chart_format_digest(chart_shape) == format_digest
+
+
+def write_chart_digest(chart_shape, digest, format_digest=None):
+    c_nv_pr = _get_c_nv_pr(chart_shape)
+    ext = _find_digest_ext(c_nv_pr)
+    if ext is None:
+        ext_lst = c_nv_pr.find(qn('a:extLst'))
+        if ext_lst is None:
+            ext_lst = etree.SubElement(c_nv_pr, qn('a:extLst'))
+        ext = etree.SubElement(ext_lst, qn('a:ext'), uri=DIGEST_EXT_URI)
+    digest_element = ext.find(DIGEST_TAG)
+    if digest_element is None:
+        digest_element = etree.SubElement(ext, DIGEST_TAG, nsmap={'pc': DIGEST_NAMESPACE})
+    digest_element.set('value', digest)
+    # NOTE: The data and the format are digested separately, so a chart added
+    # with its format is unchanged for updates that only replace the data
+    if format_digest is not None:
+        digest_element.set('format', format_digest)
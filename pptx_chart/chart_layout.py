@@ -0,0 +1,56 @@
+from pptx.util import Cm
+
+
+class ChartGrid:
+    # NOTE: Places charts left to right, top to bottom from the top left
+    # corner of the slide. When the next chart does not fit below the last row
+    # (or the slide already holds max_per_slide charts) a new slide with the
+    # same slide layout is inserted after the current one.
+    def __init__(self, slide, spacing=0, max_per_slide=None):
+        if max_per_slide is not None and max_per_slide < 1:
+            raise ValueError('max_per_slide must be at least 1, got {}'.format(max_per_slide))
+        self._presentation = slide.part.package.presentation_part.presentation
+        self._slide = slide
+        self._spacing = Cm(spacing)
+        self._max_per_slide = max_per_slide
+        self._start_slide(slide)
+
+    def _start_slide(self, slide):
+        self._slide = slide
+        self._x = 0
+        self._y = 0
+        self._row_height = 0
+        self._chart_count = 0
+
+    def _add_slide(self):
+        slides = self._presentation.slides
+        slide_idx = slides.index(self._slide)
+        slide = slides.add_slide(self._slide.slide_layout)
+        # NOTE: Empty placeholders from the slide layout would sit under the
+        # charts
+        for placeholder in list(slide.placeholders):
+            placeholder.element.getparent().remove(placeholder.element)
+        sld_id_lst = slides._sldIdLst
+        sld_id = sld_id_lst[-1]
+        sld_id_lst.remove(sld_id)
+        sld_id_lst.insert(slide_idx + 1, sld_id)
+        return slide
+
+    def place(self, cx, cy):
+        if self._x > 0 and self._x + cx > self._presentation.slide_width:
+            self._x = 0
+            self._y += self._row_height + self._spacing
+            self._row_height = 0
+        is_slide_full = (
+            self._y + cy > self._presentation.slide_height
+            or self._chart_count == self._max_per_slide
+        )
+        # NOTE: A chart larger than the slide still gets a slide of its own
+        if self._chart_count > 0 and is_slide_full:
+            self._start_slide(self._add_slide())
+
+        x, y = self._x, self._y
+        self._x += cx + self._spacing
+        self._row_height = max(self._row_height, cy)
+        self._chart_count += 1
+        return self._slide, x, y
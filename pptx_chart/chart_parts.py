@@ -0,0 +1,106 @@
+import copy
+
+from pptx.chart.data import CategoryChartData
+from pptx.chart.xmlwriter import (
+    SeriesXmlRewriterFactory,
+    _CategorySeriesXmlRewriter,
+    _CategorySeriesXmlWriter
+)
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+from pptx.parts.chart import ChartPart
+from pptx.parts.embeddedpackage import EmbeddedXlsxPart
+
+R_ID_ATTRS = (qn('r:id'), qn('r:embed'), qn('r:link'))
+R_ID_XPATH = './/*[@r:id or @r:embed or @r:link]'
+
+
+class CategorySeriesXmlRewriter(_CategorySeriesXmlRewriter):
+    # NOTE: All series of a category chart share one category cache, so it is
+    # generated once per chart instead of once per series
+
+    def __init__(self, chart_data):
+        super().__init__(chart_data)
+        self._cat = None
+
+    def _rewrite_ser_data(self, ser, series_data, date_1904):
+        ser._remove_tx()
+        ser._remove_cat()
+        ser._remove_val()
+
+        xml_writer = _CategorySeriesXmlWriter(series_data, date_1904)
+        if self._cat is None:
+            self._cat = xml_writer.cat
+
+        ser._insert_tx(xml_writer.tx)
+        ser._insert_cat(copy.deepcopy(self._cat))
+        ser._insert_val(xml_writer.val)
+
+
+def replace_series_data(chart_space, chart_type, chart_data):
+    if isinstance(chart_data, CategoryChartData):
+        rewriter = CategorySeriesXmlRewriter(chart_data)
+    else:
+        rewriter = SeriesXmlRewriterFactory(chart_type, chart_data)
+    rewriter.replace_series_data(chart_space)
+
+
+# NOTE: These mirror SlideShapes.add_chart and Chart.replace_data but take a
+# chart XML and workbook blob that were generated up front (e.g. in a worker
+# process) instead of generating them from a ChartData object.
+
+
+def add_chart_from_blobs(slide, chart_xml, xlsx_blob, x, y, cx, cy):
+    package = slide.part.package
+    chart_part = ChartPart.load(
+        package.next_partname(ChartPart.partname_template),
+        CT.DML_CHART,
+        package,
+        chart_xml
+    )
+    chart_part.chart_workbook.update_from_xlsx_blob(xlsx_blob)
+    return add_chart_part(slide, chart_part, x, y, cx, cy)
+
+
+def add_chart_from_template(slide, template_chart, chart_data, xlsx_blob, x, y, cx, cy):
+    # NOTE: Copies the (already formatted) chart XML of template_chart and
+    # only rewrites its series data, so none of the formatting is redone
+    package = slide.part.package
+    template_part = template_chart.part
+    chart_space = copy.deepcopy(template_chart._chartSpace)
+    replace_series_data(chart_space, template_chart.chart_type, chart_data)
+
+    chart_part = ChartPart(
+        package.next_partname(ChartPart.partname_template),
+        CT.DML_CHART,
+        package,
+        chart_space
+    )
+    # NOTE: Other parts referenced from the chart XML (e.g. user shapes) are
+    # shared with the template, the workbook is replaced
+    xlsx_rId = chart_space.xlsx_part_rId
+    for element in chart_space.xpath(R_ID_XPATH):
+        for attr in R_ID_ATTRS:
+            rId = element.get(attr)
+            if rId is not None and rId != xlsx_rId:
+                rel = template_part.rels[rId]
+                if rel.is_external:
+                    element.set(attr, chart_part.relate_to(rel.target_ref, rel.reltype, is_external=True))
+                else:
+                    element.set(attr, chart_part.relate_to(rel.target_part, rel.reltype))
+    chart_part.chart_workbook.xlsx_part = EmbeddedXlsxPart.new(xlsx_blob, package)
+    return add_chart_part(slide, chart_part, x, y, cx, cy)
+
+
+def add_chart_part(slide, chart_part, x, y, cx, cy):
+    rId = slide.part.relate_to(chart_part, RT.CHART)
+
+    shapes = slide.shapes
+    graphic_frame = shapes._add_chart_graphicFrame(rId, x, y, cx, cy)
+    shapes._recalculate_extents()
+    return shapes._shape_factory(graphic_frame)
+
+
+def replace_chart_data(chart, chart_data, xlsx_blob):
+    replace_series_data(chart._chartSpace, chart.chart_type, chart_data)
+    chart._workbook.update_from_xlsx_blob(xlsx_blob)
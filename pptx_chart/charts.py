@@ -0,0 +1,1545 @@
+import collections
+import concurrent.futures
+import copy
+import functools
+import io
+import json
+import logging
+import os
+import time
+
+import pptx
+from pptx.chart.data import ChartData
+from pptx.chart.series import _SeriesFactory
+from pptx.enum.chart import XL_CHART_TYPE
+from pptx.util import Cm, Pt
+from pptx.dml.color import RGBColor
+import pandas as pd
+from tqdm import tqdm
+import numpy as np
+
+from pptx_chart.not_found_error import NotFoundError
+from pptx_chart.array_series_data import ArraySeriesData
+from pptx_chart.chart_layout import ChartGrid
+from pptx_chart.downsample import DOWNSAMPLE_METHODS, downsample_indices
+from pptx_chart.chart_parts import add_chart_from_blobs, add_chart_from_template, replace_chart_data
+from pptx_chart.package_writer import save_package, set_presentation_source
+from pptx_chart.shape_index import ShapeIndex, SlideShapeIndexes
+from pptx_chart.fast_workbook_writer import FastChartData
+from pptx_chart.chart_digest import (
+    compute_digest,
+    compute_format_digest,
+    is_chart_unchanged,
+    write_chart_digest
+)
+from pptx_chart import profiler
+
+logger = logging.getLogger('pptx_chart')
+
+SPEC_PREFIXES = ('y.', 'x_axis.', 'y_axis.', 'legend.', 'chart.')
+
+# NOTE: Data files with these extensions are read with pyarrow, anything
+# else is read as CSV
+COLUMNAR_EXTENSIONS = ('.parquet', '.pq', '.feather', '.arrow', '.ipc')
+
+# NOTE: Selected with the chart.workbook_writer spec column
+WORKBOOK_WRITERS = {
+    'xlsxwriter': ChartData,
+    'fast': FastChartData
+}
+
+
+# NOTE: The enum lookup tables are built on first use
+@functools.lru_cache(maxsize=None)
+def get_legend_positions():
+    return {
+        'bottom': pptx.enum.chart.XL_LEGEND_POSITION.BOTTOM,
+        'corner': pptx.enum.chart.XL_LEGEND_POSITION.CORNER,
+        'left': pptx.enum.chart.XL_LEGEND_POSITION.LEFT,
+        'right': pptx.enum.chart.XL_LEGEND_POSITION.RIGHT,
+        'top': pptx.enum.chart.XL_LEGEND_POSITION.TOP
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_tick_label_positions():
+    return {
+        'high': pptx.enum.chart.XL_TICK_LABEL_POSITION.HIGH,
+        'low': pptx.enum.chart.XL_TICK_LABEL_POSITION.LOW,
+        'next_to_axis': pptx.enum.chart.XL_TICK_LABEL_POSITION.NEXT_TO_AXIS,
+        'none': pptx.enum.chart.XL_TICK_LABEL_POSITION.NONE
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_line_dash_styles():
+    return {
+        'dash': pptx.enum.dml.MSO_LINE.DASH,
+        'dash_dot': pptx.enum.dml.MSO_LINE.DASH_DOT,
+        'dash_dot_dot': pptx.enum.dml.MSO_LINE.DASH_DOT_DOT,
+        'long_dash': pptx.enum.dml.MSO_LINE.LONG_DASH,
+        'long_dash_dot': pptx.enum.dml.MSO_LINE.LONG_DASH_DOT,
+        'round_dot': pptx.enum.dml.MSO_LINE.ROUND_DOT,
+        'solid': pptx.enum.dml.MSO_LINE.SOLID,
+        'square_dot': pptx.enum.dml.MSO_LINE.SQUARE_DOT,
+        'dash_style_mixed': pptx.enum.dml.MSO_LINE.DASH_STYLE_MIXED,
+    }
+
+
+@functools.lru_cache(maxsize=None)
+def get_chart_types():
+    return {
+        'three_d_area': XL_CHART_TYPE.THREE_D_AREA,
+        'three_d_area_stacked': XL_CHART_TYPE.THREE_D_AREA_STACKED,
+        'three_d_area_stacked_100': XL_CHART_TYPE.THREE_D_AREA_STACKED_100,
+        'three_d_bar_clustered': XL_CHART_TYPE.THREE_D_BAR_CLUSTERED,
+        'three_d_bar_stacked': XL_CHART_TYPE.THREE_D_BAR_STACKED,
+        'three_d_bar_stacked_100': XL_CHART_TYPE.THREE_D_BAR_STACKED_100,
+        'three_d_column': XL_CHART_TYPE.THREE_D_COLUMN,
+        'three_d_column_clustered': XL_CHART_TYPE.THREE_D_COLUMN_CLUSTERED,
+        'three_d_column_stacked': XL_CHART_TYPE.THREE_D_COLUMN_STACKED,
+        'three_d_column_stacked_100': XL_CHART_TYPE.THREE_D_COLUMN_STACKED_100,
+        'three_d_line': XL_CHART_TYPE.THREE_D_LINE,
+        'three_d_pie': XL_CHART_TYPE.THREE_D_PIE,
+        'three_d_pie_exploded': XL_CHART_TYPE.THREE_D_PIE_EXPLODED,
+        'area': XL_CHART_TYPE.AREA,
+        'area_stacked': XL_CHART_TYPE.AREA_STACKED,
+        'area_stacked_100': XL_CHART_TYPE.AREA_STACKED_100,
+        'bar_clustered': XL_CHART_TYPE.BAR_CLUSTERED,
+        'bar_of_pie': XL_CHART_TYPE.BAR_OF_PIE,
+        'bar_stacked': XL_CHART_TYPE.BAR_STACKED,
+        'bar_stacked_100': XL_CHART_TYPE.BAR_STACKED_100,
+        'bubble': XL_CHART_TYPE.BUBBLE,
+        'bubble_three_d_effect': XL_CHART_TYPE.BUBBLE_THREE_D_EFFECT,
+        'column_clustered': XL_CHART_TYPE.COLUMN_CLUSTERED,
+        'column_stacked': XL_CHART_TYPE.COLUMN_STACKED,
+        'column_stacked_100': XL_CHART_TYPE.COLUMN_STACKED_100,
+        'cone_bar_clustered': XL_CHART_TYPE.CONE_BAR_CLUSTERED,
+        'cone_bar_stacked': XL_CHART_TYPE.CONE_BAR_STACKED,
+        'cone_bar_stacked_100': XL_CHART_TYPE.CONE_BAR_STACKED_100,
+        'cone_col': XL_CHART_TYPE.CONE_COL,
+        'cone_col_clustered': XL_CHART_TYPE.CONE_COL_CLUSTERED,
+        'cone_col_stacked': XL_CHART_TYPE.CONE_COL_STACKED,
+        'cone_col_stacked_100': XL_CHART_TYPE.CONE_COL_STACKED_100,
+        'cylinder_bar_clustered': XL_CHART_TYPE.CYLINDER_BAR_CLUSTERED,
+        'cylinder_bar_stacked': XL_CHART_TYPE.CYLINDER_BAR_STACKED,
+        'cylinder_bar_stacked_100': XL_CHART_TYPE.CYLINDER_BAR_STACKED_100,
+        'cylinder_col': XL_CHART_TYPE.CYLINDER_COL,
+        'cylinder_col_clustered': XL_CHART_TYPE.CYLINDER_COL_CLUSTERED,
+        'cylinder_col_stacked': XL_CHART_TYPE.CYLINDER_COL_STACKED,
+        'cylinder_col_stacked_100': XL_CHART_TYPE.CYLINDER_COL_STACKED_100,
+        'doughnut': XL_CHART_TYPE.DOUGHNUT,
+        'doughnut_exploded': XL_CHART_TYPE.DOUGHNUT_EXPLODED,
+        'line': XL_CHART_TYPE.LINE,
+        'line_markers': XL_CHART_TYPE.LINE_MARKERS,
+        'line_markers_stacked': XL_CHART_TYPE.LINE_MARKERS_STACKED,
+        'line_markers_stacked_100': XL_CHART_TYPE.LINE_MARKERS_STACKED_100,
+        'line_stacked': XL_CHART_TYPE.LINE_STACKED,
+        'line_stacked_100': XL_CHART_TYPE.LINE_STACKED_100,
+        'pie': XL_CHART_TYPE.PIE,
+        'pie_exploded': XL_CHART_TYPE.PIE_EXPLODED,
+        'pie_of_pie': XL_CHART_TYPE.PIE_OF_PIE,
+        'pyramid_bar_clustered': XL_CHART_TYPE.PYRAMID_BAR_CLUSTERED,
+        'pyramid_bar_stacked': XL_CHART_TYPE.PYRAMID_BAR_STACKED,
+        'pyramid_bar_stacked_100': XL_CHART_TYPE.PYRAMID_BAR_STACKED_100,
+        'pyramid_col': XL_CHART_TYPE.PYRAMID_COL,
+        'pyramid_col_clustered': XL_CHART_TYPE.PYRAMID_COL_CLUSTERED,
+        'pyramid_col_stacked': XL_CHART_TYPE.PYRAMID_COL_STACKED,
+        'pyramid_col_stacked_100': XL_CHART_TYPE.PYRAMID_COL_STACKED_100,
+        'radar': XL_CHART_TYPE.RADAR,
+        'radar_filled': XL_CHART_TYPE.RADAR_FILLED,
+        'radar_markers': XL_CHART_TYPE.RADAR_MARKERS,
+        'stock_hlc': XL_CHART_TYPE.STOCK_HLC,
+        'stock_ohlc': XL_CHART_TYPE.STOCK_OHLC,
+        'stock_vhlc': XL_CHART_TYPE.STOCK_VHLC,
+        'stock_vohlc': XL_CHART_TYPE.STOCK_VOHLC,
+        'surface': XL_CHART_TYPE.SURFACE,
+        'surface_top_view': XL_CHART_TYPE.SURFACE_TOP_VIEW,
+        'surface_top_view_wireframe': XL_CHART_TYPE.SURFACE_TOP_VIEW_WIREFRAME,
+        'surface_wireframe': XL_CHART_TYPE.SURFACE_WIREFRAME,
+        'xy_scatter': XL_CHART_TYPE.XY_SCATTER,
+        'xy_scatter_lines': XL_CHART_TYPE.XY_SCATTER_LINES,
+        'xy_scatter_lines_no_markers': XL_CHART_TYPE.XY_SCATTER_LINES_NO_MARKERS,
+        'xy_scatter_smooth': XL_CHART_TYPE.XY_SCATTER_SMOOTH,
+        'xy_scatter_smooth_no_markers': XL_CHART_TYPE.XY_SCATTER_SMOOTH_NO_MARKERS
+    }
+
+
+LOOKUP_TABLES = {
+    'LEGEND_POSITIONS': get_legend_positions,
+    'TICK_LABEL_POSITION': get_tick_label_positions,
+    'LINE_DASH_STYLE': get_line_dash_styles,
+    'CHART_TYPE': get_chart_types
+}
+
+
+def __getattr__(name):
+    if name in LOOKUP_TABLES:
+        return LOOKUP_TABLES[name]()
+    raise AttributeError('module {!r} has no attribute {!r}'.format(__name__, name))
+
+
+def handle_missing_chart_error(error, ignore_missing_charts):
+    if ignore_missing_charts:
+        print('WARNING:', error)
+    else:
+        raise error
+
+
+def parse_bool(value):
+    return str(value).lower() == 'true'
+
+
+def get_spec_cols(data):
+    return [col_name for col_name in data.columns if col_name.startswith(SPEC_PREFIXES)]
+
+
+def parse_spec_cols(spec_values, prefix, defaults):
+    config = copy.deepcopy(defaults)
+    for col_name, prop_value in spec_values.items():
+        if col_name.startswith(prefix):
+            prop_name = col_name[len(prefix):]
+            config[prop_name] = prop_value
+    return config
+
+
+def parse_y_specs(spec_values):
+    PREFIX = 'y.'
+    specs = collections.defaultdict(dict)
+    for col_name, prop_value in spec_values.items():
+        if col_name.startswith(PREFIX):
+            series_key = col_name[len(PREFIX):].split('.')[0]
+            prop_name = col_name[len(PREFIX) + len(series_key) + 1:]
+            specs[series_key][prop_name] = prop_value
+    specs = list(specs.values())
+    
+    for spec in specs:
+        spec['name'] = spec.get('name', spec['col'])
+    
+    return specs
+
+
+class AxisStyle:
+    def __init__(self, spec):
+        self.title = spec.get('title')
+        self.font_values = []
+        if 'tick_font' in spec:
+            self.font_values.append(('name', spec['tick_font']))
+        for key, name in (('tick_bold', 'bold'), ('tick_italic', 'italic'), ('tick_underline', 'underline')):
+            if key in spec:
+                self.font_values.append((name, parse_bool(spec[key])))
+        self.color_values = []
+        if 'tick_color' in spec:
+            self.color_values.append(('rgb', RGBColor.from_string(spec['tick_color'])))
+        if 'tick_color_brightness' in spec:
+            self.color_values.append(('brightness', float(spec['tick_color_brightness'])))
+        self.size = Pt(float(spec['tick_size'])) if 'tick_size' in spec else None
+        self.number_format = spec.get('number_format')
+        self.tick_label_position = (
+            get_tick_label_positions()[spec['tick_position']] if 'tick_position' in spec else None)
+
+    def apply(self, axis):
+        if self.title is not None:
+            axis.axis_title.text_frame.text = self.title
+        if self.font_values or self.color_values or self.size is not None:
+            font = axis.tick_labels.font
+            for name, value in self.font_values:
+                setattr(font, name, value)
+            for name, value in self.color_values:
+                setattr(font.color, name, value)
+            if self.size is not None:
+                font.size = self.size
+        if self.number_format is not None:
+            axis.tick_labels.number_format = self.number_format
+        if self.tick_label_position is not None:
+            axis.tick_label_position = self.tick_label_position
+
+
+def apply_axis_format(axis, spec):
+    AxisStyle(spec).apply(axis)
+
+
+def clean_frame_values(data, col_names):
+    values = data.loc[:, col_names].apply(pd.to_numeric).to_numpy(dtype=float)
+    return values, np.isfinite(values)
+
+
+def to_series_values(values, is_valid):
+    series_values = values.astype(object)
+    series_values[~is_valid] = None
+    return series_values.tolist()
+
+
+def clean_series_values(values):
+    values = np.asarray(pd.to_numeric(values), dtype=float)
+    return to_series_values(values, np.isfinite(values))
+
+
+def get_categories(data, x_spec):
+    categories = data.loc[:, x_spec['col']]
+    if x_spec['type'] == 'date':
+        categories = pd.to_datetime(categories)
+    return categories
+
+
+def get_downsample_spec(chart_spec):
+    if 'max_points' not in chart_spec:
+        return None
+    max_points = int(float(chart_spec['max_points']))
+    if max_points < 3:
+        raise ValueError('chart.max_points must be at least 3, got {}'.format(max_points))
+    method = chart_spec.get('downsample', 'lttb')
+    if method not in DOWNSAMPLE_METHODS:
+        raise ValueError('Unknown chart.downsample {}, expected one of {}'.format(method, DOWNSAMPLE_METHODS))
+    return max_points, method
+
+
+def get_category_positions(categories, x_spec):
+    # NOTE: Date axes space points by date, other category axes evenly
+    if x_spec['type'] == 'date' and not categories.isna().any():
+        return categories.to_numpy(dtype='datetime64[ns]').astype(np.int64)
+    return np.arange(len(categories))
+
+
+def get_chart_values(data, x_spec, y_specs):
+    # NOTE: Cleaned once per chart and shared by the chart data and its digest.
+    # All series of the chart are converted in one pass (one column per series).
+    categories = get_categories(data, x_spec)
+    values, is_valid = clean_frame_values(data, [spec['col'] for spec in y_specs])
+    return categories, values, is_valid
+
+
+def make_chart_data(data, x_spec, y_specs, chart_spec=None, chart_values=None):
+    chart_spec = chart_spec if chart_spec is not None else {}
+    chart_data = WORKBOOK_WRITERS[chart_spec.get('workbook_writer', 'xlsxwriter')]()
+
+    if chart_values is None:
+        chart_values = get_chart_values(data, x_spec, y_specs)
+    categories, values, is_valid = chart_values
+
+    downsample_spec = get_downsample_spec(chart_spec)
+    if downsample_spec is not None and len(data) > downsample_spec[0]:
+        with profiler.stage('downsample', chart_spec.get('id'), len(data)):
+            row_idx = downsample_indices(
+                get_category_positions(categories, x_spec), values, is_valid, *downsample_spec)
+        categories = categories.iloc[row_idx]
+        values = values[row_idx]
+        is_valid = is_valid[row_idx]
+
+    chart_data.categories = categories
+    for spec, series_values, series_is_valid in zip(y_specs, values.T, is_valid.T):
+        series_name = spec.get('name', spec['col'])
+        series_values = to_series_values(series_values, series_is_valid)
+        chart_data.append(ArraySeriesData(chart_data, series_name, series_values))
+    
+    return chart_data
+
+
+def get_chart_digest(chart_values, y_specs, chart_spec=None):
+    # NOTE: Digests the chart data only (the values from get_chart_values, before
+    # downsampling), the format is digested separately (see compute_format_digest)
+    categories, values, is_valid = chart_values
+    category_hashes = pd.util.hash_pandas_object(categories, index=False)
+    metadata = {
+        'series': [spec.get('name', spec['col']) for spec in y_specs]
+    }
+    # NOTE: Downsampling changes the chart data, so it is part of the digest
+    # (only when enabled, to keep the digests of other charts)
+    downsample_spec = get_downsample_spec(chart_spec) if chart_spec is not None else None
+    if downsample_spec is not None:
+        metadata['downsample'] = downsample_spec
+    return compute_digest(category_hashes.to_numpy(), values, is_valid, metadata)
+
+
+def build_specs(spec_values):
+    y_specs = parse_y_specs(spec_values)
+    
+    y_axis_spec = {}
+    y_axis_spec = parse_spec_cols(spec_values, 'y_axis.', y_axis_spec)
+
+    x_spec = {
+        'col': 'x',
+        'type': 'string',
+    }
+    x_spec = parse_spec_cols(spec_values, 'x_axis.', x_spec)
+
+    legend_spec = {
+        'enabled': 'true',
+        'position': 'bottom'
+    }
+    legend_spec = parse_spec_cols(spec_values, 'legend.', legend_spec)
+
+    chart_spec = {
+        'type': 'line',
+        'width': '20.32',
+        'height': '10.16'
+    }
+    chart_spec = parse_spec_cols(spec_values, 'chart.', chart_spec)
+
+    return {
+        'y': y_specs,
+        'x': x_spec,
+        'legend': legend_spec,
+        'chart': chart_spec,
+        'y_axis': y_axis_spec
+    }
+
+
+def compile_specs(data, facet_ids_col=None):
+    spec_cols = get_spec_cols(data)
+    if facet_ids_col is not None:
+        group_keys = data[facet_ids_col]
+    else:
+        group_keys = np.zeros(len(data), dtype=int)
+    # NOTE: first() takes the first non-null value of every spec column for
+    # every facet in one grouped aggregation
+    with profiler.stage('compile_specs', rows=len(data)):
+        spec_values = data.loc[:, spec_cols].groupby(group_keys, sort=False, dropna=True, observed=True).first()
+
+        specs = {}
+        for facet_id, row in zip(spec_values.index, spec_values.to_dict('records')):
+            row = {col_name: value for col_name, value in row.items() if not pd.isna(value)}
+            specs[facet_id] = build_specs(row)
+    return specs
+
+
+def parse_specs(data):
+    return next(iter(compile_specs(data).values()))
+
+
+def is_ref_col(col_name):
+    return col_name in ('x_axis.col', 'x_axis.type', 'facet.col') or (
+        col_name.startswith('y.') and col_name.endswith('.col'))
+
+
+def update_ref_values(ref_values, spec_data):
+    for col_name in spec_data.columns:
+        if is_ref_col(col_name):
+            ref_values[col_name].update(spec_data[col_name].dropna().unique())
+    return ref_values
+
+
+def get_data_col_dtypes(ref_values, header, spec_cols):
+    dtypes = {}
+    for col_name in ref_values['facet.col']:
+        dtypes[col_name] = 'str'
+    for col_name, col_values in ref_values.items():
+        if col_name.startswith('y.'):
+            for value_col in col_values:
+                dtypes[value_col] = 'float'
+    parse_dates = []
+    for col_name in ref_values['x_axis.col'] or {'x'}:
+        if ref_values['x_axis.type'] == {'date'}:
+            dtypes.pop(col_name, None)
+            parse_dates.append(col_name)
+        else:
+            dtypes[col_name] = 'str'
+
+    # NOTE: Columns that are also spec columns are already loaded
+    dtypes = {col_name: dtype for col_name, dtype in dtypes.items()
+              if col_name in header and col_name not in spec_cols}
+    parse_dates = [col_name for col_name in parse_dates
+                   if col_name in header and col_name not in spec_cols]
+    return dtypes, parse_dates
+
+
+def read_csv(data_file, **kwargs):
+    # NOTE: Data files are read in several passes so in-memory buffers (e.g.
+    # server request payloads) are rewound before each one
+    if hasattr(data_file, 'seek'):
+        data_file.seek(0)
+    return pd.read_csv(data_file, **kwargs)
+
+
+def is_arrow_data(data):
+    # NOTE: Checked by module name so pyarrow is never imported for other data
+    return type(data).__module__.split('.')[0] == 'pyarrow'
+
+
+def is_columnar(data_file):
+    if is_arrow_data(data_file):
+        return True
+    return isinstance(data_file, (str, os.PathLike)) and (
+        os.path.splitext(data_file)[1].lower() in COLUMNAR_EXTENSIONS)
+
+
+def get_header_spec_cols(header):
+    return [col_name for col_name in header
+            if col_name.startswith(SPEC_PREFIXES) or col_name == 'facet.col']
+
+
+def read_header(data_file):
+    if isinstance(data_file, pd.DataFrame):
+        header = list(data_file.columns)
+    elif is_columnar(data_file):
+        from pptx_chart import columnar_data
+        header = columnar_data.read_header(data_file)
+    else:
+        header = list(read_csv(data_file, nrows=0).columns)
+    return header, get_header_spec_cols(header)
+
+
+def is_faceted(data_file):
+    header, _ = read_header(data_file)
+    return 'facet.col' in header
+
+
+def check_chart_id_col(header):
+    if 'chart.id' not in header:
+        raise ValueError('Column chart.id is required to select charts by id')
+
+
+def get_chart_id_cols(facet_ids_col):
+    # NOTE: The facet column can itself be chart.id
+    return list(dict.fromkeys([facet_ids_col, 'chart.id']))
+
+
+def find_chart_facet_ids(facet_frames, facet_ids_col, chart_ids):
+    # NOTE: A facet's chart id is its first non-null chart.id value, as in
+    # compile_specs
+    facet_chart_ids = {}
+    for facet_frame in facet_frames:
+        first_rows = facet_frame.dropna().drop_duplicates(facet_ids_col)
+        for facet_id, chart_id in zip(first_rows[facet_ids_col], first_rows['chart.id']):
+            facet_chart_ids.setdefault(facet_id, str(chart_id))
+    chart_ids = set(chart_ids)
+    facet_ids = [facet_id for facet_id, chart_id in facet_chart_ids.items() if chart_id in chart_ids]
+    if not facet_ids:
+        print('WARNING: No facet charts match chart ids {}'.format(', '.join(sorted(chart_ids))))
+    return facet_ids
+
+
+def filter_chart_ids(data, chart_ids):
+    check_chart_id_col(data.columns)
+    facet_ids_col = get_facet_ids_col(data)
+    facet_ids = find_chart_facet_ids([data.loc[:, get_chart_id_cols(facet_ids_col)]], facet_ids_col, chart_ids)
+    return data.loc[data[facet_ids_col].isin(facet_ids), :]
+
+
+def to_str_values(values):
+    # NOTE: Matches reading the column from a CSV file with dtype str
+    values = values.astype(object)
+    return values.where(values.isna(), values.astype(str))
+
+
+def convert_data_dtypes(data, spec_cols, dtypes, parse_dates):
+    # NOTE: Gives in-memory and columnar data the dtypes read_data uses for
+    # CSV files
+    columns = {}
+    for col_name, dtype in dtypes.items():
+        if dtype == 'str':
+            columns[col_name] = to_str_values(data[col_name])
+        else:
+            columns[col_name] = data[col_name].astype(dtype)
+    for col_name in parse_dates:
+        columns[col_name] = pd.to_datetime(data[col_name])
+    for col_name in spec_cols:
+        columns[col_name] = to_str_values(data[col_name]).astype('category')
+    return pd.DataFrame(columns, index=data.index)
+
+
+def read_frame(data, chart_ids=None):
+    with profiler.stage('read_data', rows=len(data)):
+        header, spec_cols = read_header(data)
+        ref_cols = [col_name for col_name in spec_cols if is_ref_col(col_name)]
+        ref_values = update_ref_values(
+            collections.defaultdict(set), data.loc[:, ref_cols].apply(to_str_values))
+        dtypes, parse_dates = get_data_col_dtypes(ref_values, header, spec_cols)
+        data = convert_data_dtypes(data, spec_cols, dtypes, parse_dates)
+    if chart_ids is not None and 'facet.col' in data.columns:
+        data = filter_chart_ids(data, chart_ids)
+    return data
+
+
+def read_data(data_file, chart_ids=None):
+    if isinstance(data_file, pd.DataFrame):
+        return read_frame(data_file, chart_ids)
+    if is_columnar(data_file):
+        from pptx_chart import columnar_data
+        return columnar_data.read_data(data_file, chart_ids)
+    header, spec_cols = read_header(data_file)
+
+    # NOTE: Spec columns repeat a handful of values on every row so they are
+    # stored as categoricals. Only the data columns referenced by the specs
+    # are read, with native numeric and date dtypes.
+    with profiler.stage('read_data') as record:
+        spec_data = read_csv(data_file, usecols=spec_cols, dtype='category')
+        ref_values = update_ref_values(collections.defaultdict(set), spec_data)
+        dtypes, parse_dates = get_data_col_dtypes(ref_values, header, spec_cols)
+        value_data = read_csv(
+            data_file, 
+            usecols=list(dtypes) + parse_dates, 
+            dtype=dtypes, 
+            parse_dates=parse_dates
+        )
+        record['rows'] = len(value_data)
+    data = pd.concat([value_data, spec_data], axis=1)
+    if chart_ids is not None and 'facet.col' in data.columns:
+        data = filter_chart_ids(data, chart_ids)
+    return data
+
+
+def filter_chunks(data_chunks, facet_ids_col, facet_ids):
+    for chunk in data_chunks:
+        yield chunk.loc[chunk[facet_ids_col].isin(facet_ids), :]
+
+
+def read_data_chunks(data_file, chunk_size, chart_ids=None):
+    if isinstance(data_file, pd.DataFrame):
+        data = read_frame(data_file, chart_ids)
+        return (data.iloc[start:start + chunk_size] for start in range(0, len(data), chunk_size))
+    if is_columnar(data_file):
+        from pptx_chart import columnar_data
+        return columnar_data.read_data_chunks(data_file, chunk_size, chart_ids)
+    header, spec_cols = read_header(data_file)
+
+    ref_values = collections.defaultdict(set)
+    ref_cols = [col_name for col_name in spec_cols if is_ref_col(col_name)]
+    for ref_data in read_csv(data_file, usecols=ref_cols, dtype='str', chunksize=chunk_size):
+        update_ref_values(ref_values, ref_data)
+
+    dtypes, parse_dates = get_data_col_dtypes(ref_values, header, spec_cols)
+    dtypes.update({col_name: 'category' for col_name in spec_cols})
+
+    # NOTE: The facet ids are found before the chunk reader is opened, an
+    # in-memory buffer is shared by both passes
+    facet_ids = None
+    if chart_ids is not None and ref_values['facet.col']:
+        check_chart_id_col(header)
+        facet_ids_col = next(iter(ref_values['facet.col']))
+        facet_ids = find_chart_facet_ids(
+            read_csv(data_file, usecols=get_chart_id_cols(facet_ids_col), dtype='str', chunksize=chunk_size),
+            facet_ids_col,
+            chart_ids
+        )
+
+    data_chunks = read_csv(
+        data_file, 
+        usecols=list(dtypes) + parse_dates, 
+        dtype=dtypes, 
+        parse_dates=parse_dates, 
+        chunksize=chunk_size
+    )
+    if facet_ids is None:
+        return data_chunks
+    return filter_chunks(data_chunks, facet_ids_col, facet_ids)
+
+
+def get_facet_ids_col(data):
+    return data['facet.col'].dropna().drop_duplicates().iloc[0]
+
+
+def get_facet_iterator(data):
+    facet_ids_col = get_facet_ids_col(data)
+    # NOTE: Partition the frame in a single pass (sort=False keeps facets in
+    # order of first appearance) instead of building one boolean mask per facet
+    facet_groups = data.groupby(facet_ids_col, sort=False, dropna=True, observed=True)
+    facet_row_counts = facet_groups.size()
+    for facet_id, facet_data in tqdm(facet_groups, total=len(facet_row_counts)):
+        logger.info('facet_id: %s rows: %d', facet_id, facet_row_counts[facet_id])
+        yield facet_id, facet_data
+
+
+def get_sorted_facet_iterator(data_chunks):
+    facet_ids_col = None
+    pending_chunks = []
+    pending_facet_id = None
+    completed_facet_ids = set()
+
+    def complete_facets(chunks):
+        for facet_id, facet_data in pd.concat(chunks).groupby(facet_ids_col, sort=False, observed=True):
+            if facet_id in completed_facet_ids:
+                raise ValueError(
+                    'Facet {} is split across the data file. Data must be sorted '
+                    'by the facet column when streaming.'.format(facet_id))
+            completed_facet_ids.add(facet_id)
+            logger.info('facet_id: %s rows: %d', facet_id, len(facet_data))
+            yield facet_id, facet_data
+
+    # NOTE: Every facet except the one at the end of the current chunk is
+    # complete (input is sorted by facet), so only that trailing facet is
+    # carried over to the next chunk
+    for chunk in tqdm(data_chunks):
+        if chunk.empty:
+            continue
+        if facet_ids_col is None:
+            facet_ids_col = get_facet_ids_col(chunk)
+        chunk = chunk.loc[chunk[facet_ids_col].notna(), :]
+        if chunk.empty:
+            continue
+
+        facet_ids = chunk[facet_ids_col]
+        tail_facet_id = facet_ids.iloc[-1]
+        is_tail = (facet_ids == tail_facet_id).to_numpy()
+        head_chunk = chunk.loc[~is_tail, :]
+        if not head_chunk.empty or (pending_chunks and pending_facet_id != tail_facet_id):
+            yield from complete_facets(pending_chunks + [head_chunk])
+            pending_chunks = []
+        pending_chunks.append(chunk.loc[is_tail, :])
+        pending_facet_id = tail_facet_id
+
+    if pending_chunks:
+        yield from complete_facets(pending_chunks)
+
+
+def get_chart_series(chart):
+    # NOTE: Indexing or iterating chart.series collects every c:ser element
+    # again for each series
+    return [_SeriesFactory(ser) for ser in chart._chartSpace.plotArea.sers]
+
+
+class SeriesStyle:
+    def __init__(self, spec):
+        self.smooth = parse_bool(spec.get('smooth', 'false'))
+        self.fill_color = RGBColor.from_string(spec['fill_color']) if 'fill_color' in spec else None
+        self.fill_brightness = (
+            float(spec['fill_color_brightness']) if 'fill_color_brightness' in spec else None)
+        self.line_color_values = []
+        if 'line_color' in spec:
+            self.line_color_values.append(('rgb', RGBColor.from_string(spec['line_color'])))
+        if 'line_color_brightness' in spec:
+            self.line_color_values.append(('brightness', float(spec['line_color_brightness'])))
+        self.line_values = []
+        if 'line_width' in spec:
+            self.line_values.append(('width', Pt(float(spec['line_width']))))
+        if 'line_dash' in spec:
+            self.line_values.append(('dash_style', get_line_dash_styles()[spec['line_dash']]))
+
+    def apply(self, series):
+        series.smooth = self.smooth
+        if self.fill_color is not None or self.fill_brightness is not None:
+            fill = series.format.fill
+            if self.fill_color is not None:
+                fill.solid()
+                fill.fore_color.rgb = self.fill_color
+            if self.fill_brightness is not None:
+                fill.fore_color.brightness = self.fill_brightness
+        if self.line_color_values or self.line_values:
+            line = series.format.line
+            for name, value in self.line_color_values:
+                setattr(line.color, name, value)
+            for name, value in self.line_values:
+                setattr(line, name, value)
+
+
+class ChartStyle:
+    # NOTE: Spec values are parsed once per distinct spec (see
+    # compile_chart_style) and each chart part is looked up once per chart.
+    # The title text differs between facet charts so it is passed to apply.
+    def __init__(self, specs):
+        chart_spec = specs['chart']
+        self.title_color_values = []
+        if 'title_color' in chart_spec:
+            self.title_color_values.append(('rgb', RGBColor.from_string(chart_spec['title_color'])))
+        if 'title_color_brightness' in chart_spec:
+            self.title_color_values.append(('brightness', float(chart_spec['title_color_brightness'])))
+        self.title_font_values = []
+        if 'title_font' in chart_spec:
+            self.title_font_values.append(('name', chart_spec['title_font']))
+        if 'title_size' in chart_spec:
+            self.title_font_values.append(('size', Pt(float(chart_spec['title_size']))))
+        self.category_axis_style = AxisStyle(specs['x'])
+        self.value_axis_style = AxisStyle(specs['y_axis'])
+        self.series_styles = [SeriesStyle(spec) for spec in specs['y']]
+        legend_spec = specs['legend']
+        self.legend_enabled = parse_bool(legend_spec['enabled'])
+        self.legend_position = (
+            get_legend_positions()[legend_spec['position']] if self.legend_enabled else None)
+
+    def apply(self, chart, title=None):
+        if title is not None or self.title_color_values or self.title_font_values:
+            text_frame = chart.chart_title.text_frame
+            if title is not None:
+                text_frame.text = title
+            self.apply_title_font(text_frame)
+
+        self.category_axis_style.apply(chart.category_axis)
+        self.value_axis_style.apply(chart.value_axis)
+
+        all_series = get_chart_series(chart)
+        for i, series_style in enumerate(self.series_styles):
+            series_style.apply(all_series[i])
+
+        chart.has_legend = self.legend_enabled
+        if self.legend_enabled:
+            chart.legend.position = self.legend_position
+
+    def apply_title_font(self, text_frame):
+        if self.title_color_values or self.title_font_values:
+            font = text_frame.paragraphs[0].font
+            for name, value in self.title_color_values:
+                setattr(font.color, name, value)
+            for name, value in self.title_font_values:
+                setattr(font, name, value)
+
+
+def freeze_spec(value):
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze_spec(item)) for key, item in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze_spec(item) for item in value)
+    return value
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_frozen_chart_style(frozen_specs):
+    return ChartStyle(thaw_spec(frozen_specs))
+
+
+def thaw_spec(frozen_specs):
+    return {key: [dict(item) for item in value] if key == 'y' else dict(value)
+            for key, value in frozen_specs}
+
+
+def get_format_specs(specs, chart_keys=('title_',)):
+    return {
+        'chart': {key: value for key, value in specs['chart'].items() if key.startswith(chart_keys)},
+        'x': specs['x'],
+        'y_axis': specs['y_axis'],
+        'y': specs['y'],
+        'legend': specs['legend']
+    }
+
+
+def compile_chart_style(specs):
+    # NOTE: Facet charts almost always share their format specs, so styles
+    # are cached by spec content (chart ids, titles and other keys that differ
+    # between facets are left out of the key)
+    return _compile_frozen_chart_style(freeze_spec(get_format_specs(specs)))
+
+
+def format_chart(chart, specs):
+    compile_chart_style(specs).apply(chart, specs['chart'].get('title'))
+
+
+def get_chart_dimensions(chart_spec):
+    return (
+        Cm(0),
+        Cm(0),
+        Cm(float(chart_spec['width'])),
+        Cm(float(chart_spec['height']))
+    )
+
+
+def get_chart_grid(slide, chart_spec):
+    layout = chart_spec.get('layout')
+    if layout is None:
+        return None
+    if layout != 'grid':
+        raise ValueError('Unknown chart layout {}'.format(layout))
+    max_per_slide = chart_spec.get('max_per_slide')
+    if max_per_slide is not None:
+        max_per_slide = int(float(max_per_slide))
+    return ChartGrid(slide, float(chart_spec.get('spacing', 0)), max_per_slide)
+
+
+def place_chart(slide, grid, chart_spec):
+    x, y, cx, cy = get_chart_dimensions(chart_spec)
+    if grid is None:
+        return slide, (x, y, cx, cy)
+    slide, x, y = grid.place(cx, cy)
+    return slide, (x, y, cx, cy)
+
+
+def finish_chart(chart_shape, specs, digest):
+    chart_spec = specs['chart']
+    if 'id' in chart_spec:
+        chart_shape.name = chart_spec['id']
+    write_chart_digest(chart_shape, digest, compute_format_digest(specs))
+    chart = chart_shape.chart
+
+    with profiler.stage('format_chart', chart_spec.get('id')):
+        format_chart(chart, specs)
+
+
+def get_template_key(specs):
+    # NOTE: Everything but the title text must match for a chart to be cloned
+    # from the first facet chart
+    format_specs = get_format_specs(specs, ('type', 'title_'))
+    return freeze_spec(format_specs)
+
+
+def get_template_chart(slide, specs, templates):
+    template_name = specs['chart'].get('template')
+    if template_name is None:
+        return None
+    if template_name != 'first':
+        if template_name not in templates:
+            templates[template_name] = ShapeIndex(slide).get(template_name).chart
+        return templates[template_name]
+    template = templates.get('first')
+    if template is None or template[1] != get_template_key(specs):
+        return None
+    return template[0]
+
+
+def remember_template_chart(templates, specs, chart_shape):
+    if specs['chart'].get('template') == 'first' and 'first' not in templates:
+        templates['first'] = (chart_shape.chart, get_template_key(specs))
+
+
+def set_chart_title(chart, specs):
+    title = specs['chart'].get('title')
+    if title is None:
+        return
+    # NOTE: Replacing the text of the first run keeps the template's title
+    # formatting
+    text_frame = chart.chart_title.text_frame
+    paragraphs = text_frame.paragraphs
+    runs = paragraphs[0].runs if len(paragraphs) == 1 else ()
+    if runs and '\n' not in title:
+        runs[0].text = title
+        for run in runs[1:]:
+            run._r.getparent().remove(run._r)
+    else:
+        text_frame.text = title
+        compile_chart_style(specs).apply_title_font(text_frame)
+
+
+def finish_cloned_chart(chart_shape, specs, digest):
+    chart_spec = specs['chart']
+    if 'id' in chart_spec:
+        chart_shape.name = chart_spec['id']
+    write_chart_digest(chart_shape, digest, compute_format_digest(specs))
+    set_chart_title(chart_shape.chart, specs)
+
+
+def make_chart(slide, data, specs=None, templates=None, dimensions=None):
+    if specs is None:
+        specs = parse_specs(data)
+    if templates is None:
+        templates = {}
+    y_specs = specs['y']
+    x_spec = specs['x']
+    chart_spec = specs['chart']
+    chart_id = chart_spec.get('id')
+    if dimensions is None:
+        dimensions = get_chart_dimensions(chart_spec)
+
+    with profiler.stage('make_chart_data', chart_id, len(data)):
+        chart_values = get_chart_values(data, x_spec, y_specs)
+        chart_data = make_chart_data(data, x_spec, y_specs, chart_spec, chart_values)
+    digest = get_chart_digest(chart_values, y_specs, chart_spec)
+
+    template_chart = get_template_chart(slide, specs, templates)
+    if template_chart is not None:
+        with profiler.stage('clone_chart', chart_id, len(data)):
+            chart_shape = add_chart_from_template(
+                slide,
+                template_chart,
+                chart_data,
+                chart_data.xlsx_blob,
+                *dimensions
+            )
+        finish_cloned_chart(chart_shape, specs, digest)
+        return
+
+    with profiler.stage('add_chart', chart_id, len(data)):
+        chart_shape = slide.shapes.add_chart(
+            get_chart_types()[chart_spec['type']],
+            *dimensions,
+            chart_data
+        )
+    finish_chart(chart_shape, specs, digest)
+    remember_template_chart(templates, specs, chart_shape)
+
+
+def build_chart_blobs(data, specs):
+    # NOTE: Runs in worker processes so it must only depend on its arguments
+    chart_values = get_chart_values(data, specs['x'], specs['y'])
+    chart_data = make_chart_data(data, specs['x'], specs['y'], specs['chart'], chart_values)
+    chart_xml = chart_data.xml_bytes(get_chart_types()[specs['chart']['type']])
+    digest = get_chart_digest(chart_values, specs['y'], specs['chart'])
+    return chart_xml, chart_data.xlsx_blob, digest
+
+
+def build_template_chart_blobs(data, specs):
+    # NOTE: Runs in worker processes so it must only depend on its arguments.
+    # Cloned charts need the chart data itself, not its XML.
+    chart_values = get_chart_values(data, specs['x'], specs['y'])
+    chart_data = make_chart_data(data, specs['x'], specs['y'], specs['chart'], chart_values)
+    digest = get_chart_digest(chart_values, specs['y'], specs['chart'])
+    return chart_data, chart_data.xlsx_blob, digest
+
+
+def build_replacement_chart_data(data, x_spec, y_specs, chart_spec):
+    # NOTE: Runs in worker processes so it must only depend on its arguments
+    chart_data = make_chart_data(data, x_spec, y_specs, chart_spec)
+    return chart_data, chart_data.xlsx_blob
+
+
+def map_in_workers(func, workers, *iterables):
+    iterables = [list(iterable) for iterable in iterables]
+    chunk_size = max(1, len(iterables[0]) // (workers * 4))
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(func, *iterables, chunksize=chunk_size)
+
+
+def make_facet_charts(slide, data, workers=None):
+    facet_specs = compile_specs(data, get_facet_ids_col(data))
+    templates = {}
+    grid = get_chart_grid(slide, next(iter(facet_specs.values()))['chart'])
+    if workers is None:
+        for facet_id, facet_data in get_facet_iterator(data):
+            specs = facet_specs[facet_id]
+            chart_slide, dimensions = place_chart(slide, grid, specs['chart'])
+            make_chart(chart_slide, facet_data, specs, templates, dimensions)
+        return
+
+    # NOTE: Chart XML and workbooks are generated in parallel, charts are
+    # then attached to the slide in facet order on this process
+    facets = list(get_facet_iterator(data))
+    specs_list = [facet_specs[facet_id] for facet_id, _ in facets]
+    if any('template' in specs['chart'] for specs in specs_list):
+        make_template_facet_charts(slide, facets, specs_list, workers, templates, grid)
+        return
+    with profiler.stage('build_charts', rows=len(data)):
+        chart_blobs = list(map_in_workers(
+            build_chart_blobs, workers, [facet_data for _, facet_data in facets], specs_list))
+    for specs, (chart_xml, xlsx_blob, digest) in zip(specs_list, chart_blobs):
+        chart_slide, dimensions = place_chart(slide, grid, specs['chart'])
+        with profiler.stage('add_chart', specs['chart'].get('id')):
+            chart_shape = add_chart_from_blobs(chart_slide, chart_xml, xlsx_blob, *dimensions)
+        finish_chart(chart_shape, specs, digest)
+
+
+def make_template_facet_charts(slide, facets, specs_list, workers, templates, grid):
+    with profiler.stage('build_charts', rows=sum(len(facet_data) for _, facet_data in facets)):
+        chart_blobs = list(map_in_workers(
+            build_template_chart_blobs, workers, [facet_data for _, facet_data in facets], specs_list))
+    for specs, (chart_data, xlsx_blob, digest) in zip(specs_list, chart_blobs):
+        chart_spec = specs['chart']
+        template_chart = get_template_chart(slide, specs, templates)
+        chart_slide, dimensions = place_chart(slide, grid, chart_spec)
+        if template_chart is not None:
+            with profiler.stage('clone_chart', chart_spec.get('id')):
+                chart_shape = add_chart_from_template(
+                    chart_slide, template_chart, chart_data, xlsx_blob, *dimensions)
+            finish_cloned_chart(chart_shape, specs, digest)
+            continue
+        with profiler.stage('add_chart', chart_spec.get('id')):
+            chart_xml = chart_data.xml_bytes(get_chart_types()[chart_spec['type']])
+            chart_shape = add_chart_from_blobs(chart_slide, chart_xml, xlsx_blob, *dimensions)
+        finish_chart(chart_shape, specs, digest)
+        remember_template_chart(templates, specs, chart_shape)
+
+
+def make_streamed_facet_charts(slide, data_chunks):
+    templates = {}
+    grid = None
+    for facet_idx, (facet_id, facet_data) in enumerate(get_sorted_facet_iterator(data_chunks)):
+        specs = parse_specs(facet_data)
+        if facet_idx == 0:
+            grid = get_chart_grid(slide, specs['chart'])
+        chart_slide, dimensions = place_chart(slide, grid, specs['chart'])
+        make_chart(chart_slide, facet_data, specs, templates, dimensions)
+
+
+def new_presentation():
+    presentation = pptx.Presentation()
+    # NOTE: 1 = Title and content layout
+    presentation.slides.add_slide(presentation.slide_layouts[1])
+    return presentation
+
+
+def add_presentation_chart(presentation, data_file, slide_idx, chunk_size=None, workers=None):
+    slide = presentation.slides[slide_idx]
+
+    if chunk_size is not None and workers is not None:
+        raise ValueError('Arguments chunk_size and workers cannot be used together')
+    if chunk_size is not None and is_faceted(data_file):
+        make_streamed_facet_charts(slide, read_data_chunks(data_file, chunk_size))
+    else:
+        data = read_data(data_file)
+        if 'facet.col' in data.columns:
+            make_facet_charts(slide, data, workers)
+        else:
+            make_chart(slide, data)
+
+
+def load_presentation(presentation=None):
+    # NOTE: Accepts a pptx path, file-like object or bytes, or an already
+    # loaded Presentation (which is then modified in place)
+    with profiler.stage('load_presentation'):
+        if presentation is None:
+            return new_presentation()
+        if hasattr(presentation, 'read'):
+            presentation = presentation.read()
+        if isinstance(presentation, (bytes, bytearray, memoryview)):
+            source = presentation
+            presentation = pptx.Presentation(io.BytesIO(presentation))
+        elif isinstance(presentation, (str, os.PathLike)):
+            source = presentation
+            presentation = pptx.Presentation(presentation)
+        else:
+            return presentation
+        # NOTE: Kept so saving can copy the parts that were not modified
+        set_presentation_source(presentation, source)
+        return presentation
+
+
+def save_presentation(presentation, output_file=None, compress_level=None):
+    with profiler.stage('save'):
+        output = io.BytesIO() if output_file is None else output_file
+        writer = save_package(presentation, output, compress_level)
+        logger.info(
+            'Saved presentation: copied %d unchanged parts, compressed %d parts',
+            writer.copied_count,
+            writer.compressed_count
+        )
+        return output.getvalue() if output_file is None else None
+
+
+def render_chart(data, presentation=None, slide_idx=0, chunk_size=None, workers=None, compress_level=None):
+    if presentation is None:
+        slide_idx = 0
+    presentation = load_presentation(presentation)
+    add_presentation_chart(presentation, data, slide_idx, chunk_size, workers)
+    return save_presentation(presentation, compress_level=compress_level)
+
+
+def add_chart(
+        output_file, 
+        data_file, 
+        slide_idx=None, 
+        input_file=None, 
+        chunk_size=None, 
+        workers=None,
+        compress_level=None):
+    if input_file is None:
+        slide_idx = 0
+    presentation = load_presentation(input_file)
+    add_presentation_chart(presentation, data_file, slide_idx, chunk_size, workers)
+    save_presentation(presentation, output_file, compress_level)
+
+
+def order_y_specs(chart, y_specs):
+    y_specs_indexed = {spec['name']: spec for spec in y_specs}
+    # Ensure series order matches existing chart
+    series_names = [series.name for series in get_chart_series(chart)]
+    return [y_specs_indexed[name] for name in series_names]
+
+
+def _update_chart(data, shape_index, shape_id, should_update_format, specs=None, incremental=False):
+    chart_shape = shape_index.get(shape_id)
+    
+    if specs is None:
+        specs = parse_specs(data)
+    x_specs = specs['x']
+    y_specs = order_y_specs(chart_shape.chart, specs['y'])
+
+    chart_id = specs['chart'].get('id', shape_id)
+    with profiler.stage('chart_digest', chart_id, len(data)):
+        chart_values = get_chart_values(data, x_specs, y_specs)
+        digest = get_chart_digest(chart_values, y_specs, specs['chart'])
+    format_digest = compute_format_digest(specs) if should_update_format else None
+    if incremental and is_chart_unchanged(chart_shape, digest, format_digest):
+        return False
+
+    with profiler.stage('make_chart_data', chart_id, len(data)):
+        chart_data = make_chart_data(data, x_specs, y_specs, specs['chart'], chart_values)
+    with profiler.stage('replace_data', chart_id, len(data)):
+        chart_shape.chart.replace_data(chart_data)
+    write_chart_digest(chart_shape, digest, format_digest)
+
+    if should_update_format:
+        with profiler.stage('format_chart', chart_id):
+            format_chart(chart_shape.chart, specs)
+    return True
+
+
+def get_chart_slide_idx(chart_spec):
+    # NOTE: chart.slide is 1-based like -s/--slide
+    if 'slide' not in chart_spec:
+        return None
+    slide = int(float(chart_spec['slide']))
+    if slide < 1:
+        raise ValueError('chart.slide must be at least 1, got {}'.format(slide))
+    return slide - 1
+
+
+def _update_facet_chart(data, shape_indexes, specs, should_update_format, ignore_missing_charts, incremental):
+    shape_id = specs['chart']['id']
+    shape_index = shape_indexes.get(get_chart_slide_idx(specs['chart']))
+    try:
+        return _update_chart(data, shape_index, shape_id, should_update_format, specs, incremental)
+    except NotFoundError as err:
+        handle_missing_chart_error(err, ignore_missing_charts)
+        return False
+
+
+def log_update_summary(updated_count, facet_count):
+    logger.info('Updated %d of %d charts', updated_count, facet_count)
+
+
+def update_facet_charts(
+        data, 
+        shape_indexes, 
+        should_update_format, 
+        ignore_missing_charts, 
+        workers=None, 
+        incremental=False):
+    # NOTE: Selecting charts by id can leave no rows at all
+    if data.empty:
+        log_update_summary(0, 0)
+        return
+    facet_specs = compile_specs(data, get_facet_ids_col(data))
+    if workers is None:
+        updated_count = 0
+        for facet_id, facet_data in get_facet_iterator(data):
+            updated_count += _update_facet_chart(
+                facet_data, 
+                shape_indexes, 
+                facet_specs[facet_id], 
+                should_update_format, 
+                ignore_missing_charts, 
+                incremental
+            )
+        log_update_summary(updated_count, len(facet_specs))
+        return
+
+    # NOTE: Shapes are resolved (and unchanged charts skipped) up front so
+    # workers get the series order of the existing charts, replacement data is
+    # then applied in facet order
+    updates = []
+    for facet_id, facet_data in get_facet_iterator(data):
+        specs = facet_specs[facet_id]
+        shape_index = shape_indexes.get(get_chart_slide_idx(specs['chart']))
+        try:
+            chart_shape = shape_index.get(specs['chart']['id'])
+        except NotFoundError as err:
+            handle_missing_chart_error(err, ignore_missing_charts)
+            continue
+        y_specs = order_y_specs(chart_shape.chart, specs['y'])
+        digest = get_chart_digest(get_chart_values(facet_data, specs['x'], y_specs), y_specs, specs['chart'])
+        format_digest = compute_format_digest(specs) if should_update_format else None
+        if incremental and is_chart_unchanged(chart_shape, digest, format_digest):
+            continue
+        updates.append((chart_shape, specs, facet_data, y_specs, (digest, format_digest)))
+
+    with profiler.stage('build_charts', rows=sum(len(facet_data) for _, _, facet_data, _, _ in updates)):
+        replacements = list(map_in_workers(
+            build_replacement_chart_data,
+            workers,
+            [facet_data for _, _, facet_data, _, _ in updates],
+            [specs['x'] for _, specs, _, _, _ in updates],
+            [y_specs for _, _, _, y_specs, _ in updates],
+            [specs['chart'] for _, specs, _, _, _ in updates]
+        ))
+    for (chart_shape, specs, _, _, digests), (chart_data, xlsx_blob) in zip(updates, replacements):
+        chart_id = specs['chart']['id']
+        with profiler.stage('replace_data', chart_id, len(chart_data.categories)):
+            replace_chart_data(chart_shape.chart, chart_data, xlsx_blob)
+        write_chart_digest(chart_shape, *digests)
+        if should_update_format:
+            with profiler.stage('format_chart', chart_id):
+                format_chart(chart_shape.chart, specs)
+    log_update_summary(len(updates), len(facet_specs))
+
+
+def update_streamed_facet_charts(
+        data_chunks, 
+        shape_indexes, 
+        should_update_format, 
+        ignore_missing_charts, 
+        incremental=False):
+    updated_count = 0
+    facet_count = 0
+    for facet_id, facet_data in get_sorted_facet_iterator(data_chunks):
+        updated_count += _update_facet_chart(
+            facet_data, 
+            shape_indexes, 
+            parse_specs(facet_data), 
+            should_update_format, 
+            ignore_missing_charts, 
+            incremental
+        )
+        facet_count += 1
+    log_update_summary(updated_count, facet_count)
+
+
+def update_presentation_chart(
+        presentation, 
+        data_file, 
+        slide_idx, 
+        shape_id=None, 
+        should_update_format=False,
+        ignore_missing_charts=False,
+        chunk_size=None,
+        workers=None,
+        shape_index=None,
+        incremental=False,
+        chart_ids=None):
+    shape_indexes = SlideShapeIndexes(presentation, slide_idx, shape_index)
+
+    # NOTE: Routing charts to other decks needs the input and output files,
+    # only update_chart has them
+    header, _ = read_header(data_file)
+    if 'chart.output_file' in header:
+        raise ValueError(
+            'Column chart.output_file is only supported when updating a pptx file with update_chart '
+            '(-U without -m/--manifest), not for in-memory presentations or manifest jobs')
+    if chunk_size is not None and workers is not None:
+        raise ValueError('Arguments chunk_size and workers cannot be used together')
+    if chunk_size is not None and is_faceted(data_file):
+        update_streamed_facet_charts(
+            read_data_chunks(data_file, chunk_size, chart_ids), 
+            shape_indexes, 
+            should_update_format, 
+            ignore_missing_charts, 
+            incremental
+        )
+    else:
+        data = read_data(data_file, chart_ids)
+        if 'facet.col' in data.columns:
+            update_facet_charts(
+                data, shape_indexes, should_update_format, ignore_missing_charts, workers, incremental)
+        else:
+            if shape_id is None:
+                raise ValueError('Argument shape_id is required')
+            try:
+                _update_chart(
+                    data, shape_indexes.get(), shape_id, should_update_format, incremental=incremental)
+            except NotFoundError as err:
+                handle_missing_chart_error(err, ignore_missing_charts)
+
+
+def update_chart_file(
+        input_file, 
+        output_file, 
+        data, 
+        slide_idx, 
+        should_update_format, 
+        ignore_missing_charts, 
+        incremental,
+        compress_level=None):
+    # NOTE: Runs in worker processes so it must only depend on its arguments
+    presentation = load_presentation(input_file)
+    update_facet_charts(
+        data, 
+        SlideShapeIndexes(presentation, slide_idx), 
+        should_update_format, 
+        ignore_missing_charts, 
+        incremental=incremental
+    )
+    save_presentation(presentation, output_file, compress_level)
+    return output_file
+
+
+def update_chart_files(
+        input_file, 
+        data_file, 
+        slide_idx, 
+        output_file, 
+        should_update_format=False,
+        ignore_missing_charts=False,
+        chunk_size=None,
+        workers=None,
+        incremental=False,
+        chart_ids=None,
+        compress_level=None):
+    if chunk_size is not None:
+        raise ValueError('Argument chunk_size cannot be used with the chart.output_file column')
+    data = read_data(data_file, chart_ids)
+    if 'facet.col' not in data.columns:
+        raise ValueError('Column facet.col is required to route charts with chart.output_file')
+    if data.empty:
+        log_update_summary(0, 0)
+        return
+
+    # NOTE: The data is read once and split by output file. Facets without
+    # chart.output_file go to output_file.
+    facet_ids_col = get_facet_ids_col(data)
+    facet_specs = compile_specs(data, facet_ids_col)
+    output_facet_ids = collections.defaultdict(list)
+    for facet_id, specs in facet_specs.items():
+        output_facet_ids[specs['chart'].get('output_file', output_file)].append(facet_id)
+    output_files = list(output_facet_ids)
+    output_data = [data[data[facet_ids_col].isin(output_facet_ids[path])] for path in output_files]
+
+    # NOTE: Every deck starts from the same input file, read once up front so
+    # no worker reads it while another writes it
+    with open(input_file, 'rb') as f:
+        input_blob = f.read()
+    args = (
+        [input_blob] * len(output_files),
+        output_files,
+        output_data,
+        [slide_idx] * len(output_files),
+        [should_update_format] * len(output_files),
+        [ignore_missing_charts] * len(output_files),
+        [incremental] * len(output_files),
+        [compress_level] * len(output_files)
+    )
+    if len(output_files) == 1 or workers == 1:
+        written_files = map(update_chart_file, *args)
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            written_files = list(executor.map(update_chart_file, *args))
+    for path in written_files:
+        print('Wrote {}'.format(path))
+
+
+def update_chart(
+        input_file, 
+        data_file, 
+        slide_idx, 
+        shape_id=None, 
+        output_file=None, 
+        should_update_format=False,
+        ignore_missing_charts=False,
+        chunk_size=None,
+        workers=None,
+        incremental=False,
+        chart_ids=None,
+        compress_level=None):
+    output_file = output_file if output_file is not None else input_file
+    header, _ = read_header(data_file)
+    if 'chart.output_file' in header:
+        update_chart_files(
+            input_file,
+            data_file,
+            slide_idx,
+            output_file,
+            should_update_format=should_update_format,
+            ignore_missing_charts=ignore_missing_charts,
+            chunk_size=chunk_size,
+            workers=workers,
+            incremental=incremental,
+            chart_ids=chart_ids,
+            compress_level=compress_level
+        )
+        return
+    presentation = load_presentation(input_file)
+
+    update_presentation_chart(
+        presentation,
+        data_file,
+        slide_idx,
+        shape_id=shape_id,
+        should_update_format=should_update_format,
+        ignore_missing_charts=ignore_missing_charts,
+        chunk_size=chunk_size,
+        workers=workers,
+        incremental=incremental,
+        chart_ids=chart_ids
+    )
+
+    save_presentation(presentation, output_file, compress_level)
+
+
+def render_chart_update(
+        data, 
+        presentation, 
+        slide_idx=0, 
+        shape_id=None, 
+        should_update_format=False,
+        ignore_missing_charts=False,
+        chunk_size=None,
+        workers=None,
+        incremental=False,
+        chart_ids=None,
+        compress_level=None):
+    presentation = load_presentation(presentation)
+    update_presentation_chart(
+        presentation,
+        data,
+        slide_idx,
+        shape_id=shape_id,
+        should_update_format=should_update_format,
+        ignore_missing_charts=ignore_missing_charts,
+        chunk_size=chunk_size,
+        workers=workers,
+        incremental=incremental,
+        chart_ids=chart_ids
+    )
+    return save_presentation(presentation, compress_level=compress_level)
+
+
+def parse_chart_ids(value):
+    if isinstance(value, str):
+        return [chart_id.strip() for chart_id in value.split(',') if chart_id.strip()]
+    return [str(chart_id) for chart_id in value]
+
+
+def read_manifest(manifest_file):
+    extension = os.path.splitext(manifest_file)[1].lower()
+    if extension == '.json':
+        with open(manifest_file) as f:
+            jobs = json.load(f)
+    elif extension in ('.yaml', '.yml'):
+        try:
+            import yaml
+        except ImportError as err:
+            raise ImportError('PyYAML is required to read YAML manifests') from err
+        with open(manifest_file) as f:
+            jobs = yaml.safe_load(f)
+    elif extension == '.csv':
+        jobs = pd.read_csv(manifest_file, dtype='str').to_dict('records')
+    else:
+        raise ValueError('Unsupported manifest file type: {}'.format(manifest_file))
+
+    # NOTE: Data file paths are relative to the manifest file
+    manifest_dir = os.path.dirname(manifest_file)
+    parsed_jobs = []
+    for job in jobs:
+        job = {key: value for key, value in job.items() if isinstance(value, list) or not pd.isna(value)}
+        mode = str(job.get('mode', 'add')).lower()
+        if mode not in ('add', 'update'):
+            raise ValueError('Unsupported manifest job mode: {}'.format(mode))
+        parsed_jobs.append({
+            'mode': mode,
+            'data_file': os.path.join(manifest_dir, str(job['data_file'])),
+            'slide_idx': int(job.get('slide', 1)) - 1,
+            'shape_id': str(job['shape_id']) if 'shape_id' in job else None,
+            'should_update_format': parse_bool(job.get('update_format', 'false')),
+            'ignore_missing_charts': parse_bool(job.get('ignore_missing_charts', 'false')),
+            'chunk_size': int(job['chunk_size']) if 'chunk_size' in job else None,
+            'incremental': parse_bool(job.get('incremental', 'false')),
+            'chart_ids': parse_chart_ids(job['chart_ids']) if 'chart_ids' in job else None
+        })
+    return parsed_jobs
+
+
+def run_manifest(manifest_file, output_file=None, input_file=None, workers=None, compress_level=None):
+    output_file = output_file if output_file is not None else input_file
+    jobs = read_manifest(manifest_file)
+
+    start_time = time.perf_counter()
+    presentation = load_presentation(input_file)
+    print('Loaded presentation in {:.3f}s'.format(time.perf_counter() - start_time))
+
+    # NOTE: Shape indexes are shared by all update jobs on a slide and
+    # rebuilt after every add job, which can also insert slides (grid layout)
+    # and so move the slides after the one it adds to
+    shape_indexes = {}
+    for i, job in enumerate(jobs):
+        job_start_time = time.perf_counter()
+        slide_idx = job['slide_idx']
+        if job['mode'] == 'add':
+            shape_indexes.clear()
+            add_presentation_chart(
+                presentation, job['data_file'], slide_idx, job['chunk_size'], workers)
+        else:
+            if slide_idx not in shape_indexes:
+                shape_indexes[slide_idx] = ShapeIndex(presentation.slides[slide_idx])
+            update_presentation_chart(
+                presentation,
+                job['data_file'],
+                slide_idx,
+                shape_id=job['shape_id'],
+                should_update_format=job['should_update_format'],
+                ignore_missing_charts=job['ignore_missing_charts'],
+                chunk_size=job['chunk_size'],
+                workers=workers,
+                shape_index=shape_indexes[slide_idx],
+                incremental=job['incremental'],
+                chart_ids=job['chart_ids']
+            )
+        print('Job {} ({} {}, slide {}) took {:.3f}s'.format(
+            i + 1, job['mode'], job['data_file'], job['slide_idx'] + 1, 
+            time.perf_counter() - job_start_time))
+
+    save_start_time = time.perf_counter()
+    save_presentation(presentation, output_file, compress_level)
+    print('Saved presentation in {:.3f}s'.format(time.perf_counter() - save_start_time))
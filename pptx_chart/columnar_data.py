@@ -0,0 +1,88 @@
+import collections
+import os
+
+from pptx_chart import profiler
+from pptx_chart.charts import (
+    check_chart_id_col,
+    convert_data_dtypes,
+    find_chart_facet_ids,
+    get_chart_id_cols,
+    get_data_col_dtypes,
+    get_header_spec_cols,
+    is_ref_col,
+    to_str_values,
+    update_ref_values
+)
+
+DATASET_FORMATS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.ipc': 'feather'
+}
+
+
+def open_dataset(data_file):
+    try:
+        import pyarrow.dataset
+    except ImportError as err:
+        raise ImportError('pyarrow is required to read Parquet, Arrow or Feather data files') from err
+    if not isinstance(data_file, (str, os.PathLike)):
+        # NOTE: In-memory Arrow tables and record batches
+        return pyarrow.dataset.dataset(data_file)
+    data_format = DATASET_FORMATS[os.path.splitext(data_file)[1].lower()]
+    return pyarrow.dataset.dataset(data_file, format=data_format)
+
+
+def read_header(data_file):
+    return open_dataset(data_file).schema.names
+
+
+def to_frame(table, spec_cols, dtypes, parse_dates):
+    return convert_data_dtypes(table.to_pandas(), spec_cols, dtypes, parse_dates)
+
+
+def scan_dataset(data_file, chart_ids=None):
+    dataset = open_dataset(data_file)
+    import pyarrow
+    import pyarrow.dataset
+    header = dataset.schema.names
+    spec_cols = get_header_spec_cols(header)
+
+    # NOTE: The columns referenced by the specs are found from a scan of the
+    # (small, repetitive) reference spec columns, then only those columns
+    # are read
+    ref_cols = [col_name for col_name in spec_cols if is_ref_col(col_name)]
+    ref_data = dataset.to_table(columns=ref_cols).to_pandas()
+    ref_data = ref_data.apply(to_str_values)
+    ref_values = update_ref_values(collections.defaultdict(set), ref_data)
+    dtypes, parse_dates = get_data_col_dtypes(ref_values, header, spec_cols)
+
+    # NOTE: Selecting charts by id is pushed down to the reader as a filter on
+    # the facet column, so the data of other facets is never loaded
+    row_filter = None
+    if chart_ids is not None and ref_values['facet.col']:
+        check_chart_id_col(header)
+        facet_ids_col = next(iter(ref_values['facet.col']))
+        facet_data = dataset.to_table(columns=get_chart_id_cols(facet_ids_col)).to_pandas()
+        facet_ids = find_chart_facet_ids([facet_data], facet_ids_col, chart_ids)
+        facet_ids = pyarrow.array(facet_ids, type=dataset.schema.field(facet_ids_col).type)
+        row_filter = pyarrow.dataset.field(facet_ids_col).isin(facet_ids)
+
+    columns = list(dtypes) + parse_dates + spec_cols
+    return dataset, columns, row_filter, (spec_cols, dtypes, parse_dates)
+
+
+def read_data(data_file, chart_ids=None):
+    with profiler.stage('read_data') as record:
+        dataset, columns, row_filter, col_types = scan_dataset(data_file, chart_ids)
+        data = to_frame(dataset.to_table(columns=columns, filter=row_filter), *col_types)
+        record['rows'] = len(data)
+    return data
+
+
+def read_data_chunks(data_file, chunk_size, chart_ids=None):
+    dataset, columns, row_filter, col_types = scan_dataset(data_file, chart_ids)
+    for batch in dataset.to_batches(columns=columns, filter=row_filter, batch_size=chunk_size):
+        yield to_frame(batch, *col_types)
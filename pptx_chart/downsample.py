@@ -0,0 +1,92 @@
+import numpy as np
+
+DOWNSAMPLE_METHODS = ('lttb', 'minmax')
+
+
+def scale_values(values, is_valid):
+    # NOTE: Series are scaled to [0, 1] so each contributes equally to the
+    # point selection whatever its magnitude. Invalid values become NaN.
+    lows = np.min(np.where(is_valid, values, np.inf), axis=0)
+    highs = np.max(np.where(is_valid, values, -np.inf), axis=0)
+    spans = np.where(highs > lows, highs - lows, 1.0)
+    with np.errstate(invalid='ignore'):
+        return np.where(is_valid, (values - lows) / spans, np.nan)
+
+
+def lttb_indices(x, values, is_valid, max_points):
+    # NOTE: Largest-Triangle-Three-Buckets. The first and last rows are always
+    # kept, the rows in between are split into max_points - 2 buckets and the
+    # row forming the largest triangle (summed over all series) with the last
+    # selected row and the mean of the next bucket is kept from each bucket.
+    row_count = len(x)
+    y = scale_values(values, is_valid)
+    edges = np.linspace(1, row_count - 1, max_points - 1).astype(int)
+
+    # NOTE: The last reduceat segment is the last row on its own, so avg_x[i + 1]
+    # is the anchor for bucket i
+    y_valid = ~np.isnan(y)
+    counts = np.diff(np.append(edges, row_count))
+    avg_x = np.add.reduceat(x, edges) / counts
+    with np.errstate(invalid='ignore', divide='ignore'):
+        avg_y = np.add.reduceat(np.where(y_valid, y, 0), edges, axis=0) / np.add.reduceat(y_valid, edges, axis=0)
+
+    selected = np.empty(max_points, dtype=int)
+    selected[0] = 0
+    selected[-1] = row_count - 1
+    a = 0
+    for bucket_idx in range(max_points - 2):
+        start, end = edges[bucket_idx], edges[bucket_idx + 1]
+        next_x, next_y = avg_x[bucket_idx + 1], avg_y[bucket_idx + 1]
+        areas = np.abs(
+            (x[a] - next_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end, np.newaxis]) * (next_y - y[a])
+        )
+        a = start + int(np.argmax(np.nansum(areas, axis=1)))
+        selected[bucket_idx + 1] = a
+    return selected
+
+
+def first_matches(is_match, bucket_ids):
+    rows = np.flatnonzero(is_match)
+    _, first_idx = np.unique(bucket_ids[rows], return_index=True)
+    return rows[first_idx]
+
+
+def minmax_indices(values, is_valid, max_points):
+    # NOTE: Keeps the first and last rows and the rows holding the minimum and
+    # maximum of every series in each bucket, so peaks are never dropped
+    row_count, series_count = values.shape
+    bucket_count = max(1, (max_points - 2) // (2 * series_count))
+    edges = np.linspace(1, row_count - 1, bucket_count + 1).astype(int)
+    sizes = np.diff(edges)
+    bucket_ids = np.repeat(np.arange(bucket_count), sizes)
+    starts = edges[:-1] - 1
+
+    inner_values = np.where(is_valid, values, np.nan)[1:row_count - 1]
+    with np.errstate(invalid='ignore'):
+        lows = np.repeat(np.fmin.reduceat(inner_values, starts, axis=0), sizes, axis=0)
+        highs = np.repeat(np.fmax.reduceat(inner_values, starts, axis=0), sizes, axis=0)
+    selected = [np.array([0, row_count - 1])]
+    for series_idx in range(series_count):
+        series_values = inner_values[:, series_idx]
+        selected.append(1 + first_matches(series_values == lows[:, series_idx], bucket_ids))
+        selected.append(1 + first_matches(series_values == highs[:, series_idx], bucket_ids))
+    selected = np.unique(np.concatenate(selected))
+    if len(selected) > max_points:
+        # NOTE: max_points is too small for a minimum and maximum of every
+        # series (2 + 2 * series_count points), so the inner points are thinned
+        # out evenly
+        inner = selected[1:-1]
+        keep = np.linspace(0, len(inner) - 1, max_points - 2).astype(int)
+        selected = np.concatenate([selected[:1], inner[keep], selected[-1:]])
+    return selected
+
+
+def downsample_indices(x, values, is_valid, max_points, method='lttb'):
+    if len(values) <= max_points:
+        return np.arange(len(values))
+    if method == 'lttb':
+        return lttb_indices(np.asarray(x, dtype=float), values, is_valid, max_points)
+    if method == 'minmax':
+        return minmax_indices(values, is_valid, max_points)
+    raise ValueError('Unknown downsample method {}, expected one of {}'.format(method, DOWNSAMPLE_METHODS))
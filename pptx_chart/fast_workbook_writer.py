@@ -0,0 +1,158 @@
+import io
+import zipfile
+from xml.sax.saxutils import escape
+
+import numpy as np
+import pandas as pd
+from pptx.chart.data import ChartData
+from pptx.chart.xlsx import CategoryWorkbookWriter
+from pptx.util import lazyproperty
+
+# NOTE: Minimal SpreadsheetML package holding a single worksheet named Sheet1
+# (the name python-pptx uses in the chart's cell references). Cells are
+# written column-at-a-time as pre-rendered XML strings and strings are
+# stored inline so no shared string table is needed.
+CONTENT_TYPES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    '<Default Extension="xml" ContentType="application/xml"/>'
+    '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+    '</Types>'
+)
+
+ROOT_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+    '</Relationships>'
+)
+
+WORKBOOK_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    '<sheets><sheet name="Sheet1" sheetId="1" r:id="rId1"/></sheets>'
+    '</workbook>'
+)
+
+WORKBOOK_RELS_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>'
+    '<Relationship Id="rId2" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles" Target="styles.xml"/>'
+    '</Relationships>'
+)
+
+# NOTE: Style 0 is General, style 1 uses custom number format 164 (the
+# category number format) and style 2 custom number format 165 (the series
+# number format)
+STYLES_XML = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<styleSheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<numFmts count="2">'
+    '<numFmt numFmtId="164" formatCode="{category_format}"/>'
+    '<numFmt numFmtId="165" formatCode="{series_format}"/>'
+    '</numFmts>'
+    '<fonts count="1"><font><sz val="11"/><name val="Calibri"/><family val="2"/></font></fonts>'
+    '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+    '<fill><patternFill patternType="gray125"/></fill></fills>'
+    '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+    '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+    '<cellXfs count="3">'
+    '<xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+    '<xf numFmtId="164" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '<xf numFmtId="165" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+    '</cellXfs>'
+    '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+    '</styleSheet>'
+)
+
+SHEET_XML_START = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+    '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+    '<cols><col min="1" max="1" width="10.7109375" customWidth="1"/></cols>'
+    '<sheetData>'
+)
+
+SHEET_XML_END = '</sheetData></worksheet>'
+
+EXCEL_EPOCH = pd.Timestamp('1899-12-30')
+
+
+def _string_cells(col_ref, labels):
+    return [
+        '<c r="{}{}" t="inlineStr"><is><t>{}</t></is></c>'.format(
+            col_ref, row, escape(str(label)))
+        if label is not None and label == label else ''
+        for row, label in enumerate(labels, 2)
+    ]
+
+
+def _number_cells(col_ref, values, style):
+    values = np.asarray(values, dtype=float)
+    is_valid = np.isfinite(values)
+    return [
+        '<c r="{}{}" s="{}"><v>{!r}</v></c>'.format(col_ref, row, style, value)
+        if valid else ''
+        for row, value, valid in zip(range(2, len(values) + 2), values.tolist(), is_valid.tolist())
+    ]
+
+
+class FastCategoryWorkbookWriter(CategoryWorkbookWriter):
+    # NOTE: Writes the same Sheet1 layout as CategoryWorkbookWriter (categories
+    # in column A, one column per series, names in row 1) so the cell
+    # references in the chart XML stay valid and the chart remains editable
+    @property
+    def xlsx_blob(self):
+        categories = self._chart_data.categories
+        if categories.depth != 1:
+            return super().xlsx_blob
+
+        columns = [self._category_cells(categories)]
+        header_cells = ['']
+        for series in self._chart_data:
+            col_ref = self._series_col_letter(series)
+            header_cells.append('<c r="{}1" t="inlineStr"><is><t>{}</t></is></c>'.format(
+                col_ref, escape(str(series.name))))
+            columns.append(_number_cells(col_ref, series.values, 2))
+
+        rows = ['<row r="1">{}</row>'.format(''.join(header_cells))]
+        for row, cells in enumerate(zip(*columns), 2):
+            rows.append('<row r="{}">{}</row>'.format(row, ''.join(cells)))
+        sheet_xml = SHEET_XML_START + ''.join(rows) + SHEET_XML_END
+
+        series_format = self._chart_data.number_format
+        styles_xml = STYLES_XML.format(
+            category_format=escape(categories.number_format, {'"': '&quot;'}),
+            series_format=escape(series_format, {'"': '&quot;'})
+        )
+
+        xlsx_file = io.BytesIO()
+        with zipfile.ZipFile(xlsx_file, 'w', zipfile.ZIP_DEFLATED) as xlsx_zip:
+            xlsx_zip.writestr('[Content_Types].xml', CONTENT_TYPES_XML)
+            xlsx_zip.writestr('_rels/.rels', ROOT_RELS_XML)
+            xlsx_zip.writestr('xl/workbook.xml', WORKBOOK_XML)
+            xlsx_zip.writestr('xl/_rels/workbook.xml.rels', WORKBOOK_RELS_XML)
+            xlsx_zip.writestr('xl/styles.xml', styles_xml)
+            xlsx_zip.writestr('xl/worksheets/sheet1.xml', sheet_xml)
+        return xlsx_file.getvalue()
+
+    def _category_cells(self, categories):
+        labels = [category.label for category in categories]
+        if categories.are_dates:
+            # NOTE: Excel serial dates count days from 1899-12-30 (valid from
+            # 1900-03-01 onwards because of Excel's 1900 leap year bug)
+            serials = (pd.DatetimeIndex(labels) - EXCEL_EPOCH) / pd.Timedelta(days=1)
+            return _number_cells('A', serials, 1)
+        if categories.are_numeric:
+            return _number_cells('A', labels, 1)
+        return _string_cells('A', labels)
+
+
+class FastChartData(ChartData):
+    @lazyproperty
+    def _workbook_writer(self):
+        return FastCategoryWorkbookWriter(self)
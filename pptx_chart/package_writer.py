@@ -0,0 +1,158 @@
+import copy
+import io
+import os
+import struct
+import tempfile
+import weakref
+import zipfile
+import zlib
+
+from pptx.opc.serialized import PackageWriter
+
+# NOTE: Where the package of each loaded presentation was read from (a path
+# or the pptx bytes), so saving it can copy the zip members that did not change
+PACKAGE_SOURCES = weakref.WeakKeyDictionary()
+
+DATA_DESCRIPTOR_FLAG = 0x08
+
+
+def set_presentation_source(presentation, source):
+    PACKAGE_SOURCES[presentation.part.package] = source
+
+
+def open_source_zip(source):
+    if source is None:
+        return None
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        source = io.BytesIO(source)
+    try:
+        return zipfile.ZipFile(source)
+    except (OSError, zipfile.BadZipFile):
+        # NOTE: The source was moved, replaced or is not a zip file; every
+        # member is then compressed again
+        return None
+
+
+def read_raw_member(source_zip, member):
+    source_zip.fp.seek(member.header_offset)
+    header = struct.unpack(zipfile.structFileHeader, source_zip.fp.read(zipfile.sizeFileHeader))
+    # NOTE: The local header's name and extra field lengths (fields 10 and 11)
+    # can differ from the central directory's
+    source_zip.fp.seek(header[10] + header[11], os.SEEK_CUR)
+    return source_zip.fp.read(member.compress_size)
+
+
+class RawCopyZipWriter:
+    # NOTE: Implements python-pptx's physical package writer interface. A blob
+    # whose size and CRC match the source member of the same name is written
+    # by copying the member's compressed bytes, everything else is deflated.
+    def __init__(self, pkg_file, source_zip, compress_level=None):
+        self._zip_file = zipfile.ZipFile(pkg_file, 'w', compression=zipfile.ZIP_DEFLATED)
+        self._source_zip = source_zip
+        self._compress_level = compress_level
+        self.copied_count = 0
+        self.compressed_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_traceback):
+        self._zip_file.close()
+
+    def _find_source_member(self, name, blob):
+        if self._source_zip is None:
+            return None
+        try:
+            member = self._source_zip.getinfo(name)
+        except KeyError:
+            return None
+        if member.file_size != len(blob) or member.CRC != zlib.crc32(blob):
+            return None
+        return member
+
+    def write(self, pack_uri, blob):
+        name = pack_uri.membername
+        member = self._find_source_member(name, blob)
+        if member is None:
+            self._zip_file.writestr(name, blob, compresslevel=self._compress_level)
+            self.compressed_count += 1
+            return
+        raw = read_raw_member(self._source_zip, member)
+        member = copy.copy(member)
+        # NOTE: Sizes and CRC go in the local header, the source's data
+        # descriptor (if any) is not copied
+        member.flag_bits &= ~DATA_DESCRIPTOR_FLAG
+        zip_file = self._zip_file
+        member.header_offset = zip_file.fp.tell()
+        zip_file.fp.write(member.FileHeader())
+        zip_file.fp.write(raw)
+        zip_file.start_dir = zip_file.fp.tell()
+        zip_file.filelist.append(member)
+        zip_file.NameToInfo[name] = member
+        zip_file._didModify = True
+        self.copied_count += 1
+
+
+class RawCopyPackageWriter(PackageWriter):
+    def __init__(self, pkg_file, pkg_rels, parts, source_zip, compress_level=None):
+        super().__init__(pkg_file, pkg_rels, parts)
+        self._source_zip = source_zip
+        self._compress_level = compress_level
+        self.copied_count = 0
+        self.compressed_count = 0
+
+    def _write(self):
+        with RawCopyZipWriter(self._pkg_file, self._source_zip, self._compress_level) as phys_writer:
+            self._write_content_types_stream(phys_writer)
+            self._write_pkg_rels(phys_writer)
+            self._write_parts(phys_writer)
+        self.copied_count = phys_writer.copied_count
+        self.compressed_count = phys_writer.compressed_count
+
+
+def write_package(presentation, pkg_file, compress_level=None):
+    package = presentation.part.package
+    source_zip = open_source_zip(PACKAGE_SOURCES.get(package))
+    try:
+        writer = RawCopyPackageWriter(
+            pkg_file, package._rels, tuple(package.iter_parts()), source_zip, compress_level)
+        writer._write()
+    finally:
+        if source_zip is not None:
+            source_zip.close()
+    return writer
+
+
+def get_file_mode(path):
+    # NOTE: Temporary files are created private, the output keeps the mode of
+    # the file it replaces or gets the usual mode for new files
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def save_package(presentation, output_file, compress_level=None):
+    if compress_level is not None and not 0 <= compress_level <= 9:
+        raise ValueError('Compression level must be between 0 and 9, got {}'.format(compress_level))
+    if not isinstance(output_file, (str, os.PathLike)):
+        return write_package(presentation, output_file, compress_level)
+
+    # NOTE: Written to a temporary file next to the output and then renamed,
+    # so the output is never left half written (and the source, which may be
+    # the output itself, is read until the rename)
+    output_dir = os.path.dirname(os.path.abspath(output_file))
+    file_mode = get_file_mode(output_file)
+    fd, temp_file = tempfile.mkstemp(
+        dir=output_dir, prefix='.{}.'.format(os.path.basename(output_file)), suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            writer = write_package(presentation, f, compress_level)
+        os.chmod(temp_file, file_mode)
+        os.replace(temp_file, output_file)
+    except BaseException:
+        os.remove(temp_file)
+        raise
+    return writer
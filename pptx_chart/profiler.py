@@ -0,0 +1,110 @@
+import collections
+import contextlib
+import csv
+import json
+import sys
+import time
+import tracemalloc
+
+RECORD_FIELDS = ['stage', 'chart_id', 'rows', 'seconds', 'peak_memory_mb']
+
+_active_profiler = None
+
+
+class Profiler:
+    # NOTE: Records the wall time, row count and (optionally) the peak traced
+    # memory of every stage. Hooks are called with each record as soon as the
+    # stage finishes, e.g. to forward them to a metrics system. Tracing memory
+    # slows down allocation heavy stages several times (and unevenly), so it
+    # is off by default to keep the stage timings representative.
+    def __init__(self, track_memory=False):
+        self.records = []
+        self._hooks = []
+        # NOTE: Per stage peaks need tracemalloc.reset_peak (Python 3.9+)
+        self._track_memory = track_memory and hasattr(tracemalloc, 'reset_peak')
+        self._peaks = []
+
+    def add_hook(self, hook):
+        self._hooks.append(hook)
+
+    def start(self):
+        if self._track_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def stop(self):
+        if self._track_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def stage(self, name, chart_id=None, rows=None):
+        is_tracing = self._track_memory and tracemalloc.is_tracing()
+        if is_tracing:
+            # NOTE: reset_peak() also resets the peak of enclosing stages, so
+            # each active stage carries the peak it has seen so far
+            if self._peaks:
+                self._peaks[-1] = max(self._peaks[-1], tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+            self._peaks.append(0)
+        record = {'stage': name, 'chart_id': chart_id, 'rows': rows}
+        start_time = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = time.perf_counter() - start_time
+            record['peak_memory_mb'] = None
+            if is_tracing:
+                peak_memory = max(tracemalloc.get_traced_memory()[1], self._peaks.pop())
+                if self._peaks:
+                    self._peaks[-1] = max(self._peaks[-1], peak_memory)
+                record['peak_memory_mb'] = peak_memory / 2 ** 20
+            self._add_record(record)
+
+    def _add_record(self, record):
+        self.records.append(record)
+        for hook in self._hooks:
+            hook(record)
+
+    def summary(self):
+        totals = collections.OrderedDict()
+        for record in self.records:
+            total = totals.setdefault(record['stage'], {'count': 0, 'seconds': 0.0, 'rows': 0})
+            total['count'] += 1
+            total['seconds'] += record['seconds']
+            total['rows'] += record['rows'] or 0
+        return totals
+
+    def print_summary(self, file=sys.stderr):
+        print('{:<20} {:>8} {:>12} {:>12}'.format('stage', 'count', 'rows', 'seconds'), file=file)
+        for stage, total in self.summary().items():
+            print('{:<20} {:>8} {:>12} {:>12.4f}'.format(
+                stage, total['count'], total['rows'], total['seconds']), file=file)
+
+    def write_report(self, report_file):
+        if report_file.lower().endswith('.csv'):
+            with open(report_file, 'w', newline='') as f:
+                writer = csv.DictWriter(f, fieldnames=RECORD_FIELDS)
+                writer.writeheader()
+                writer.writerows(self.records)
+        else:
+            with open(report_file, 'w') as f:
+                json.dump({'stages': self.summary(), 'records': self.records}, f, indent=2)
+
+
+def get_profiler():
+    return _active_profiler
+
+
+def set_profiler(profiler):
+    global _active_profiler
+    _active_profiler = profiler
+
+
+@contextlib.contextmanager
+def stage(name, chart_id=None, rows=None):
+    # NOTE: Yields the stage record so callers can fill in fields (e.g. rows)
+    # that are only known once the stage has run
+    if _active_profiler is None:
+        yield {}
+        return
+    with _active_profiler.stage(name, chart_id, rows) as record:
+        yield record
@@ -0,0 +1,185 @@
+import collections
+import copy
+import http.server
+import io
+import os
+import socketserver
+import urllib.parse
+
+import pptx
+
+from pptx_chart.charts import (
+    parse_bool,
+    parse_chart_ids,
+    render_chart,
+    render_chart_update
+)
+from pptx_chart.not_found_error import NotFoundError
+from pptx_chart.package_writer import set_presentation_source
+
+PPTX_CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.presentationml.presentation'
+
+
+class TemplateCache:
+    # NOTE: Keeps the most recently used template presentations parsed in
+    # memory. Each request gets a deep copy (about twice as fast as parsing
+    # the pptx again) so the cached presentation is never modified.
+    def __init__(self, max_size=8):
+        self._max_size = max_size
+        self._presentations = collections.OrderedDict()
+
+    def get(self, template_file):
+        mtime = os.path.getmtime(template_file)
+        cached = self._presentations.get(template_file)
+        if cached is not None and cached[0] == mtime:
+            self._presentations.move_to_end(template_file)
+        else:
+            cached = (mtime, pptx.Presentation(template_file))
+            self._presentations[template_file] = cached
+            while len(self._presentations) > self._max_size:
+                self._presentations.popitem(last=False)
+        presentation = copy.deepcopy(cached[1])
+        set_presentation_source(presentation, template_file)
+        return presentation
+
+
+class RequestError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def get_param(params, name, default=None):
+    values = params.get(name)
+    return values[-1] if values else default
+
+
+def resolve_template(templates_dir, template_name):
+    if templates_dir is None:
+        raise RequestError(400, 'Templates are not enabled (start the server with --templates-dir)')
+    # NOTE: Templates must resolve to files inside the templates directory
+    templates_dir = os.path.realpath(templates_dir)
+    template_file = os.path.realpath(os.path.join(templates_dir, template_name))
+    if os.path.commonpath([templates_dir, template_file]) != templates_dir or not os.path.isfile(template_file):
+        raise RequestError(404, 'Template not found: {}'.format(template_name))
+    return template_file
+
+
+def render(path, params, data, template_cache, templates_dir=None, workers=None):
+    template_name = get_param(params, 'template')
+    presentation = None
+    if template_name is not None:
+        presentation = template_cache.get(resolve_template(templates_dir, template_name))
+    elif path == '/update':
+        raise RequestError(400, 'Parameter template is required for /update')
+
+    slide_idx = int(get_param(params, 'slide', 1)) - 1
+    chunk_size = get_param(params, 'chunk_size')
+    chunk_size = int(chunk_size) if chunk_size is not None else None
+    chart_ids = get_param(params, 'chart_ids')
+    chart_ids = parse_chart_ids(chart_ids) if chart_ids is not None else None
+    compress_level = get_param(params, 'compress_level')
+    compress_level = int(compress_level) if compress_level is not None else None
+    if path == '/add':
+        return render_chart(data, presentation, slide_idx, chunk_size, workers, compress_level)
+    return render_chart_update(
+        data,
+        presentation,
+        slide_idx,
+        shape_id=get_param(params, 'shape_id'),
+        should_update_format=parse_bool(get_param(params, 'update_format', 'false')),
+        ignore_missing_charts=parse_bool(get_param(params, 'ignore_missing_charts', 'false')),
+        chunk_size=chunk_size,
+        workers=workers,
+        incremental=parse_bool(get_param(params, 'incremental', 'false')),
+        chart_ids=chart_ids,
+        compress_level=compress_level
+    )
+
+
+class ChartRequestHandler(http.server.BaseHTTPRequestHandler):
+    # NOTE: POST /add and POST /update take the CSV data file as the request
+    # body and the remaining options (template, slide, shape_id,
+    # update_format, ignore_missing_charts, chunk_size, incremental,
+    # chart_ids, compress_level) as query parameters. The response body is the rendered pptx.
+    def do_GET(self):
+        if urllib.parse.urlsplit(self.path).path == '/health':
+            self._send(200, b'ok', 'text/plain')
+        else:
+            self._send(404, b'Not found', 'text/plain')
+
+    def do_POST(self):
+        url = urllib.parse.urlsplit(self.path)
+        if url.path not in ('/add', '/update'):
+            self._send(404, b'Not found', 'text/plain')
+            return
+
+        try:
+            content_length = int(self.headers.get('Content-Length', 0))
+            data = io.BytesIO(self.rfile.read(content_length))
+            pptx_bytes = render(
+                url.path,
+                urllib.parse.parse_qs(url.query),
+                data,
+                self.server.template_cache,
+                self.server.templates_dir,
+                self.server.workers
+            )
+        except RequestError as err:
+            self._send(err.status, str(err).encode('utf-8'), 'text/plain')
+        except (ValueError, KeyError, NotFoundError) as err:
+            self._send(400, '{}: {}'.format(type(err).__name__, err).encode('utf-8'), 'text/plain')
+        except Exception as err:
+            self.log_error('Failed to render %s: %r', self.path, err)
+            self._send(500, '{}: {}'.format(type(err).__name__, err).encode('utf-8'), 'text/plain')
+        else:
+            self._send(200, pptx_bytes, PPTX_CONTENT_TYPE)
+
+    def address_string(self):
+        # NOTE: Unix socket clients have no (host, port) address
+        if isinstance(self.client_address, tuple):
+            return super().address_string()
+        return 'unix'
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class UnixHTTPServer(socketserver.UnixStreamServer):
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)
+        super().server_bind()
+
+
+def make_server(address, templates_dir=None, template_cache_size=8, workers=None):
+    # NOTE: Requests are handled one at a time on a single thread; presentations
+    # and the active profiler are not safe to share between threads
+    if address.startswith('unix:'):
+        server = UnixHTTPServer(address[len('unix:'):], ChartRequestHandler)
+    else:
+        host, _, port = address.rpartition(':')
+        if not port.isdigit():
+            raise ValueError('Server address must be HOST:PORT or unix:PATH, got {}'.format(address))
+        server = http.server.HTTPServer((host or '127.0.0.1', int(port)), ChartRequestHandler)
+    server.template_cache = TemplateCache(template_cache_size)
+    server.templates_dir = templates_dir
+    server.workers = workers
+    return server
+
+
+def serve(address, templates_dir=None, template_cache_size=8, workers=None):
+    server = make_server(address, templates_dir, template_cache_size, workers)
+    print('Serving on {}'.format(address))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if isinstance(server, UnixHTTPServer) and os.path.exists(server.server_address):
+            os.unlink(server.server_address)
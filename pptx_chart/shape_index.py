@@ -0,0 +1,44 @@
+import collections
+
+from pptx_chart.not_found_error import NotFoundError
+
+
+class ShapeIndex:
+    # NOTE: Maps selection pane names (and numeric shape ids) to the shapes of
+    # a slide so each lookup does not scan the whole shape tree
+    def __init__(self, slide):
+        self._shapes_by_name = collections.defaultdict(list)
+        self._shapes_by_id = {}
+        for shape in slide.shapes:
+            self.add(shape)
+
+    def add(self, shape):
+        self._shapes_by_name[shape.name].append(shape)
+        self._shapes_by_id[shape.shape_id] = shape
+
+    def get(self, shape_id):
+        shapes = self._shapes_by_name.get(shape_id, [])
+        if len(shapes) > 1:
+            raise ValueError('Found {} shapes with id {}'.format(len(shapes), shape_id))
+        if shapes:
+            return shapes[0]
+        if str(shape_id).isdigit() and int(shape_id) in self._shapes_by_id:
+            return self._shapes_by_id[int(shape_id)]
+        raise NotFoundError('Shape with id {} not found'.format(shape_id))
+
+
+class SlideShapeIndexes:
+    # NOTE: Shape indexes of the slides that facet charts are routed to (with
+    # chart.slide), each built on first use
+    def __init__(self, presentation, slide_idx, shape_index=None):
+        self._presentation = presentation
+        self.slide_idx = slide_idx
+        self._shape_indexes = {}
+        if shape_index is not None:
+            self._shape_indexes[slide_idx] = shape_index
+
+    def get(self, slide_idx=None):
+        slide_idx = self.slide_idx if slide_idx is None else slide_idx
+        if slide_idx not in self._shape_indexes:
+            self._shape_indexes[slide_idx] = ShapeIndex(self._presentation.slides[slide_idx])
+        return self._shape_indexes[slide_idx]
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from pptx_chart.downsample import DOWNSAMPLE_METHODS, downsample_indices
+
+
+def make_values(row_count, series_count, seed=0):
+    values = np.random.default_rng(seed).normal(size=(row_count, series_count))
+    return values, np.isfinite(values)
+
+
+def check_indices(indices, row_count, max_points):
+    assert len(indices) <= max_points
+    assert np.all(np.diff(indices) > 0)
+    assert indices[0] == 0
+    assert indices[-1] == row_count - 1
+
+
+@pytest.mark.parametrize('method', DOWNSAMPLE_METHODS)
+@pytest.mark.parametrize('series_count', [1, 2, 5])
+@pytest.mark.parametrize('max_points', [3, 4, 5, 7, 10])
+def test_small_max_points(method, series_count, max_points):
+    values, is_valid = make_values(100, series_count)
+    indices = downsample_indices(np.arange(100), values, is_valid, max_points, method)
+    check_indices(indices, 100, max_points)
+
+
+@pytest.mark.parametrize('method', DOWNSAMPLE_METHODS)
+@pytest.mark.parametrize('max_points', [3, 10])
+def test_all_nan_series(method, max_points):
+    values, _ = make_values(50, 2)
+    values[:, 1] = np.nan
+    is_valid = np.isfinite(values)
+    check_indices(downsample_indices(np.arange(50), values, is_valid, max_points, method), 50, max_points)
+
+    values[:, 0] = np.nan
+    is_valid = np.isfinite(values)
+    check_indices(downsample_indices(np.arange(50), values, is_valid, max_points, method), 50, max_points)
+
+
+@pytest.mark.parametrize('method', DOWNSAMPLE_METHODS)
+@pytest.mark.parametrize('series_count', [1, 3])
+@pytest.mark.parametrize('row_offset', [-1, 0, 1, 2, 5])
+def test_rows_near_max_points(method, series_count, row_offset):
+    max_points = 20
+    row_count = max_points + row_offset
+    values, is_valid = make_values(row_count, series_count)
+    indices = downsample_indices(np.arange(row_count), values, is_valid, max_points, method)
+    check_indices(indices, row_count, max_points)
+    if row_count <= max_points:
+        assert np.array_equal(indices, np.arange(row_count))
+
+
+def test_minmax_keeps_extremes():
+    values, is_valid = make_values(1000, 2)
+    indices = downsample_indices(np.arange(1000), values, is_valid, 50, 'minmax')
+    for series_idx in range(2):
+        assert np.argmin(values[:, series_idx]) in indices
+        assert np.argmax(values[:, series_idx]) in indices
+
+
+def test_unknown_method():
+    values, is_valid = make_values(10, 1)
+    with pytest.raises(ValueError):
+        downsample_indices(np.arange(10), values, is_valid, 5, 'mean')
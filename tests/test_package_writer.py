@@ -0,0 +1,112 @@
+import io
+import zipfile
+
+import pandas as pd
+import pptx
+
+from pptx_chart.charts import load_presentation, make_chart
+from pptx_chart.package_writer import DATA_DESCRIPTOR_FLAG, save_package
+
+
+class NonSeekableWriter(io.RawIOBase):
+    # NOTE: zipfile writes sizes and CRCs in data descriptors after each
+    # member when the output cannot seek
+    def __init__(self):
+        self.buffer = io.BytesIO()
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        return self.buffer.write(b)
+
+
+def make_source_pptx(path):
+    presentation = pptx.Presentation()
+    slide = presentation.slides.add_slide(presentation.slide_layouts[6])
+    slide.shapes.add_textbox(0, 0, 100, 100).text_frame.text = 'unchanged'
+    presentation.save(path)
+
+
+def add_test_chart(presentation):
+    data = pd.DataFrame({
+        'x': [1, 2, 3],
+        'y': [0.5, 1.5, 2.5],
+        'y.0.col': 'y',
+        'x_axis.col': 'x',
+        'x_axis.type': 'category',
+        'chart.type': 'line',
+        'chart.width': 10,
+        'chart.height': 8,
+        'legend.enabled': 'false',
+        'chart.id': 'CHART_1'
+    })
+    make_chart(presentation.slides[0], data)
+
+
+def read_members(source):
+    with zipfile.ZipFile(source) as zip_file:
+        assert zip_file.testzip() is None
+        return {info.filename: zip_file.read(info) for info in zip_file.infolist()}
+
+
+def with_data_descriptors(pptx_bytes):
+    writer = NonSeekableWriter()
+    with zipfile.ZipFile(io.BytesIO(pptx_bytes)) as source_zip, \
+            zipfile.ZipFile(writer, 'w', compression=zipfile.ZIP_DEFLATED) as target_zip:
+        for info in source_zip.infolist():
+            target_zip.writestr(info.filename, source_zip.read(info))
+    return writer.buffer.getvalue()
+
+
+def test_unchanged_members_are_copied(tmp_path):
+    source_file = tmp_path / 'source.pptx'
+    output_file = tmp_path / 'output.pptx'
+    make_source_pptx(source_file)
+
+    presentation = load_presentation(str(source_file))
+    add_test_chart(presentation)
+    writer = save_package(presentation, str(output_file))
+
+    assert writer.copied_count > 0
+    assert writer.compressed_count > 0
+    source_members = read_members(source_file)
+    output_members = read_members(output_file)
+    copied_names = [name for name in source_members if source_members[name] == output_members.get(name)]
+    assert len(copied_names) >= writer.copied_count
+    assert any(name.startswith('ppt/charts/') for name in output_members)
+    assert pptx.Presentation(str(output_file)).slides[0].shapes[-1].has_chart
+
+
+def test_data_descriptor_source(tmp_path):
+    source_file = tmp_path / 'source.pptx'
+    make_source_pptx(source_file)
+    source_bytes = with_data_descriptors(source_file.read_bytes())
+    with zipfile.ZipFile(io.BytesIO(source_bytes)) as source_zip:
+        assert all(info.flag_bits & DATA_DESCRIPTOR_FLAG for info in source_zip.infolist())
+
+    output = io.BytesIO()
+    writer = save_package(load_presentation(source_bytes), output)
+
+    assert writer.copied_count > 0
+    assert read_members(io.BytesIO(output.getvalue())) == read_members(io.BytesIO(source_bytes))
+    with zipfile.ZipFile(io.BytesIO(output.getvalue())) as output_zip:
+        assert not any(info.flag_bits & DATA_DESCRIPTOR_FLAG for info in output_zip.infolist())
+
+
+def test_overwrite_in_place(tmp_path):
+    pptx_file = tmp_path / 'report.pptx'
+    make_source_pptx(pptx_file)
+    source_members = read_members(pptx_file)
+
+    presentation = load_presentation(str(pptx_file))
+    add_test_chart(presentation)
+    writer = save_package(presentation, str(pptx_file), compress_level=1)
+
+    assert writer.copied_count > 0
+    assert list(tmp_path.iterdir()) == [pptx_file]
+    output_members = read_members(pptx_file)
+    for name, blob in source_members.items():
+        if not name.startswith(('ppt/slides/', '[Content_Types]')):
+            assert output_members[name] == blob
+    assert pptx.Presentation(str(pptx_file)).slides[0].shapes[-1].has_chart
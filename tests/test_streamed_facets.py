@@ -0,0 +1,51 @@
+import pandas as pd
+import pytest
+
+from pptx_chart.charts import get_sorted_facet_iterator
+
+
+def make_data(facet_ids):
+    return pd.DataFrame({
+        'facet': facet_ids,
+        'value': range(len(facet_ids)),
+        'facet.col': 'facet'
+    })
+
+
+def split_chunks(data, chunk_size):
+    return [data.iloc[start:start + chunk_size] for start in range(0, len(data), chunk_size)]
+
+
+def collect_facets(data_chunks):
+    return [(facet_id, facet_data['value'].tolist())
+            for facet_id, facet_data in get_sorted_facet_iterator(data_chunks)]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 4, 7, 100])
+def test_facets_split_across_chunks(chunk_size):
+    data = make_data(['a'] * 5 + ['b'] + ['c'] * 3)
+    assert collect_facets(split_chunks(data, chunk_size)) == [
+        ('a', [0, 1, 2, 3, 4]),
+        ('b', [5]),
+        ('c', [6, 7, 8])
+    ]
+
+
+def test_empty_chunks_and_missing_facet_ids():
+    data = make_data(['a', 'a', None, 'b', 'b'])
+    chunks = [data.iloc[:0]] + split_chunks(data, 2) + [data.iloc[:0]]
+    assert collect_facets(chunks) == [('a', [0, 1]), ('b', [3, 4])]
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 3, 4])
+def test_unsorted_facets(chunk_size):
+    data = make_data(['a', 'a', 'b', 'b', 'a'])
+    with pytest.raises(ValueError, match='Facet a is split'):
+        collect_facets(split_chunks(data, chunk_size))
+
+
+def test_unsorted_facets_within_one_chunk():
+    # NOTE: Only facets split across chunks are an error, rows within a chunk
+    # are grouped by facet
+    data = make_data(['a', 'a', 'b', 'b', 'a'])
+    assert collect_facets([data]) == [('b', [2, 3]), ('a', [0, 1, 4])]